@@ -7,27 +7,61 @@ geométricas (translação, rotação, escala e reflexão).
 """
 
 from PyQt6 import uic, QtWidgets, QtGui, QtCore
+import concurrent.futures
+import collections
+import contextlib
+import functools
 import sys
 import os
+import time
 
 from utils.drawable import Drawing, Point, Line, Circle, Polygon
-from utils.algorithms import Transformations, DDA, BresenhamLines, BresenhamCircle, ClippingCS, ClippingLB
+from utils.algorithms import Transformations, DDA, BresenhamLines, BresenhamCircle
+from utils.framebuffer import ArrayFramebuffer, TiledFramebuffer
+from utils.spatial import UniformGrid
+from utils.scene import SceneStore, scene_batches
+from utils.viewport import Viewport
+from utils import render
 
 class CanvasWidget(QtWidgets.QWidget):
 	"""Widget de desenho com buffer lógico.
 
 	Mantém uma QImage de baixa resolução (buffer_w x buffer_h) que é escalada
 	para o tamanho do widget, facilitando a visualização dos pixels.
+
+	Com `array_buffer=True` os pixels vivem em um `ArrayFramebuffer` (matriz
+	NumPy uint32) e `self.buffer` é apenas uma QImage que embrulha essa mesma
+	memória, sem cópia; escritas, limpezas e recortes viram operações de array.
+
+	Com `tiled=True` (canvas lógicos grandes) os pixels vivem em um
+	`TiledFramebuffer`, em blocos alocados sob demanda; não há uma QImage
+	única (`self.buffer` é None) e o quadro exibido é montado bloco a bloco.
 	"""
 
-	def __init__(self, controller, buffer_width=80, buffer_height=80):
+	# nº máximo de cores distintas mantidas no cache cor -> ARGB
+	COLOR_CACHE_SIZE = 256
+	# largura mínima (px do widget) de uma célula para desenhar a grade
+	GRID_MIN_CELL = 2
+
+	def __init__(self, controller, buffer_width=80, buffer_height=80, array_buffer=False, tiled=False):
 		super().__init__()
 		self.controller = controller
 		# resolução lógica do buffer (pequena para evidenciar rasterização)
 		self.buffer_w = max(1, int(buffer_width))
 		self.buffer_h = max(1, int(buffer_height))
-		self.buffer = QtGui.QImage(self.buffer_w, self.buffer_h, QtGui.QImage.Format.Format_RGB32)
-		self.buffer.fill(QtGui.QColor('white'))
+		self.tiled = bool(tiled)
+		if self.tiled:
+			self.framebuffer = TiledFramebuffer(self.buffer_w, self.buffer_h, QtGui.QColor('white').rgba())
+			self.buffer = None
+		elif array_buffer:
+			# a QImage compartilha a memória da matriz (manter a referência viva)
+			self.framebuffer = ArrayFramebuffer(self.buffer_w, self.buffer_h, QtGui.QColor('white').rgba())
+			self.buffer = QtGui.QImage(self.framebuffer.pixels.data, self.buffer_w, self.buffer_h,
+				self.framebuffer.stride, QtGui.QImage.Format.Format_RGB32)
+		else:
+			self.framebuffer = None
+			self.buffer = QtGui.QImage(self.buffer_w, self.buffer_h, QtGui.QImage.Format.Format_RGB32)
+			self.buffer.fill(QtGui.QColor('white'))
 		# permite expandir para ocupar a área disponível
 		self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
 		self.setMouseTracking(True)
@@ -43,30 +77,23 @@ class CanvasWidget(QtWidgets.QWidget):
 		self.show_grid = True
 		# pivô (coords de buffer) para transformações
 		self.pivot_point = None
+		# buffer escalado + grade em cache (ver frame) e região desatualizada dele
+		self._frame = None
+		self._frame_dirty = None
+		# quadro aberto (begin_frame/end_frame): região alterada e repinturas adiadas
+		self._frame_depth = 0
+		self._damage = None
+		self._overlay_dirty = False
+		self._pending_updates = 0
+		self.updates_saved = 0
+		self._grid_key = None
+		self._grid_lines = []
 
 	def paintEvent(self, event):
 		"""Desenha a imagem de buffer escalada e sobreposições (grade, seleção, pivô)."""
 		painter = QtGui.QPainter(self)
-		scaled = self.buffer.scaled(self.width(), self.height(), QtCore.Qt.AspectRatioMode.IgnoreAspectRatio, QtCore.Qt.TransformationMode.FastTransformation)
-		painter.drawImage(0, 0, scaled)
-		# grade entre pixels para facilitar contagem/visualização
-		if self.show_grid and self.buffer_w > 0 and self.buffer_h > 0:
-			pen = QtGui.QPen(QtGui.QColor(180, 180, 180, 160))
-			pen.setCosmetic(True)
-			pen.setWidth(1)
-			painter.setPen(pen)
-			cell_w = self.width() / self.buffer_w
-			cell_h = self.height() / self.buffer_h
-			# linhas verticais
-			for i in range(1, self.buffer_w):
-				x = round(i * cell_w)
-				painter.drawLine(x, 0, x, self.height())
-			# linhas horizontais
-			for j in range(1, self.buffer_h):
-				y = round(j * cell_h)
-				painter.drawLine(0, y, self.width(), y)
-			# borda externa
-			painter.drawRect(0, 0, self.width()-1, self.height()-1)
+		# buffer escalado e grade vêm prontos do cache: um único blit
+		painter.drawPixmap(0, 0, self.frame())
 		# retângulo de seleção durante o arrasto
 		if self.drag_select_start and self.drag_select_end:
 			pen = QtGui.QPen(QtGui.QColor(0, 180, 255))
@@ -102,25 +129,274 @@ class CanvasWidget(QtWidgets.QWidget):
 			painter.drawLine(cx-6, cy, cx+6, cy)
 			painter.drawLine(cx, cy-6, cx, cy+6)
 
+	def invalidate_frame(self):
+		"""Descarta o quadro escalado em cache (o buffer mudou) e agenda repintura."""
+		self._frame = None
+		self._frame_dirty = None
+		self.update()
+
+	def frame_stale(self, rect_buf):
+		"""Marca `rect_buf` (coords de buffer) como desatualizado no quadro em cache.
+
+		Com blocos só essa região do quadro é refeita; com o buffer único o
+		quadro inteiro é escalado de novo.
+		"""
+		if self._frame is None:
+			return
+		if self.tiled:
+			self._frame_dirty = rect_buf if self._frame_dirty is None else self._frame_dirty.united(rect_buf)
+		else:
+			self._frame = None
+
+	def begin_frame(self):
+		"""Abre um quadro: escritas no buffer só acumulam a região alterada.
+
+		Quadros podem ser aninhados; a repintura sai no `end_frame` mais externo.
+		"""
+		self._frame_depth += 1
+
+	def end_frame(self):
+		"""Fecha o quadro e agenda uma única repintura da região acumulada."""
+		self._frame_depth -= 1
+		if self._frame_depth > 0:
+			return
+		damage, overlay = self._damage, self._overlay_dirty
+		self._damage, self._overlay_dirty = None, False
+		if self._pending_updates:
+			# as chamadas adiadas viraram uma só
+			self.updates_saved += self._pending_updates - 1
+			self._pending_updates = 0
+		if damage is not None:
+			self.frame_stale(damage)
+		if overlay:
+			self.update()
+		elif damage is not None:
+			self.update(self.damage_to_widget(damage))
+		self.controller.on_canvas_frame_end()
+
+	@contextlib.contextmanager
+	def painting(self):
+		"""Contexto `with` equivalente a begin_frame()/end_frame()."""
+		self.begin_frame()
+		try:
+			yield self
+		finally:
+			self.end_frame()
+
+	def damage_to_widget(self, rect_buf):
+		"""Região do widget a repintar para `rect_buf` (folga cobre arredondamentos)."""
+		return self.buffer_rect_to_widget(rect_buf).adjusted(-2, -2, 2, 2)
+
+	def damage(self, rect_buf=None):
+		"""Registra que o buffer mudou em `rect_buf` (QRect em coords de buffer; None = todo).
+
+		Fora de um quadro agenda a repintura da região na hora; dentro, apenas
+		acumula a região para o `end_frame`.
+		"""
+		if rect_buf is None:
+			rect_buf = QtCore.QRect(0, 0, self.buffer_w, self.buffer_h)
+		if self._frame_depth:
+			self._damage = rect_buf if self._damage is None else self._damage.united(rect_buf)
+			self._pending_updates += 1
+			return
+		self.frame_stale(rect_buf)
+		self.update(self.damage_to_widget(rect_buf))
+
+	def overlay_changed(self):
+		"""Sobreposições (pivô, seleção) mudaram: repinta o widget, ou adia dentro de um quadro."""
+		if self._frame_depth:
+			self._overlay_dirty = True
+			self._pending_updates += 1
+			return
+		self.update()
+
+	def grid_lines(self):
+		"""Linhas da grade entre pixels para o tamanho atual, calculadas uma vez por tamanho."""
+		key = (self.width(), self.height(), self.buffer_w, self.buffer_h)
+		if key != self._grid_key:
+			cell_w = self.width() / self.buffer_w
+			cell_h = self.height() / self.buffer_h
+			# linhas verticais e horizontais
+			lines = [QtCore.QLine(round(i * cell_w), 0, round(i * cell_w), self.height()) for i in range(1, self.buffer_w)]
+			lines += [QtCore.QLine(0, round(j * cell_h), self.width(), round(j * cell_h)) for j in range(1, self.buffer_h)]
+			self._grid_key, self._grid_lines = key, lines
+		return self._grid_lines
+
+	def frame(self):
+		"""Buffer escalado para o widget, com a grade por cima, em cache.
+
+		Refeito só quando o conteúdo do buffer, o tamanho do widget (ou a
+		densidade de pixels da tela) ou a grade mudam; repinturas causadas por
+		sobreposições (arrasto do recorte, seleção, pivô) reaproveitam o quadro.
+		Com blocos, mudanças no buffer refazem só a região alterada do quadro.
+		"""
+		dpr = self.devicePixelRatioF()
+		if self._frame is None or self._frame.deviceIndependentSize() != QtCore.QSizeF(self.size()) \
+				or self._frame.devicePixelRatio() != dpr:
+			if self.tiled:
+				frame = QtGui.QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+				frame.setDevicePixelRatio(dpr)
+				self.paint_tiles(frame)
+			else:
+				# escala direto para pixels físicos, sem reamostrar de novo na tela
+				scaled = self.buffer.scaled(round(self.width() * dpr), round(self.height() * dpr),
+					QtCore.Qt.AspectRatioMode.IgnoreAspectRatio, QtCore.Qt.TransformationMode.FastTransformation)
+				frame = QtGui.QPixmap.fromImage(scaled)
+				frame.setDevicePixelRatio(dpr)
+				self.paint_grid(frame)
+			self._frame = frame
+			self._frame_dirty = None
+		elif self._frame_dirty is not None:
+			self.paint_tiles(self._frame, self._frame_dirty)
+			self._frame_dirty = None
+		return self._frame
+
+	def paint_tiles(self, frame, rect_buf=None):
+		"""Desenha no quadro os blocos do `TiledFramebuffer` (e a grade).
+
+		Só a região `rect_buf` (coords de buffer; None = tudo) é refeita, e só
+		os blocos alocados que a intersectam são enviados ao QPainter; o resto
+		é preenchido com a cor de fundo.
+		"""
+		fb = self.framebuffer
+		area = fb.bounds(None if rect_buf is None else self.rect_bounds(rect_buf))
+		if area is None:
+			return
+		sx = self.width() / self.buffer_w
+		sy = self.height() / self.buffer_h
+		painter = QtGui.QPainter(frame)
+		if rect_buf is not None:
+			painter.setClipRect(self.damage_to_widget(rect_buf))
+		painter.fillRect(self.rect(), QtGui.QColor.fromRgba(fb.background))
+		t = fb.TILE
+		for key in fb.tiles_in(area):
+			tile = fb.tiles.get(key)
+			if tile is None:
+				continue
+			x1, y1, x2, y2 = fb.tile_rect(*key)
+			image = QtGui.QImage(tile.data, t, t, tile.strides[0], QtGui.QImage.Format.Format_RGB32)
+			painter.drawImage(QtCore.QRectF(x1 * sx, y1 * sy, (x2 - x1 + 1) * sx, (y2 - y1 + 1) * sy),
+				image, QtCore.QRectF(0, 0, x2 - x1 + 1, y2 - y1 + 1))
+		painter.end()
+		self.paint_grid(frame, rect_buf)
+
+	@staticmethod
+	def rect_bounds(rect):
+		"""QRect como tupla inclusiva (x1, y1, x2, y2)."""
+		return rect.left(), rect.top(), rect.right(), rect.bottom()
+
+	def paint_grid(self, frame, rect_buf=None):
+		"""Desenha a grade entre pixels (e a borda) no quadro, se couber na tela."""
+		if not self.show_grid:
+			return
+		painter = QtGui.QPainter(frame)
+		if rect_buf is not None:
+			painter.setClipRect(self.damage_to_widget(rect_buf))
+		pen = QtGui.QPen(QtGui.QColor(180, 180, 180, 160))
+		pen.setCosmetic(True)
+		pen.setWidth(1)
+		painter.setPen(pen)
+		# com células menores que GRID_MIN_CELL a grade só escureceria o quadro
+		if min(self.width() / self.buffer_w, self.height() / self.buffer_h) >= self.GRID_MIN_CELL:
+			painter.drawLines(self.grid_lines())
+		# borda externa
+		painter.drawRect(0, 0, self.width()-1, self.height()-1)
+		painter.end()
+
 	def drawGrid(self, show: bool = True):
 		"""Liga/desliga a grade de visualização."""
 		self.show_grid = show
-		self.update()
+		self.invalidate_frame()
+
+	def clip_bounds(self):
+		"""Retângulo de recorte ativo como tupla inclusiva (x1, y1, x2, y2), ou None."""
+		if self.clip_rect is None:
+			return None
+		r = self.clip_rect
+		return r.left(), r.top(), r.right(), r.bottom()
+
+	def writable_bounds(self):
+		"""Área gravável (buffer ∩ recorte ativo) como tupla inclusiva; pode ser vazia."""
+		x1, y1, x2, y2 = 0, 0, self.buffer_w - 1, self.buffer_h - 1
+		clip = self.clip_bounds()
+		if clip is not None:
+			x1, y1 = max(x1, clip[0]), max(y1, clip[1])
+			x2, y2 = min(x2, clip[2]), min(y2, clip[3])
+		return x1, y1, x2, y2
+
+	@staticmethod
+	@functools.lru_cache(maxsize=COLOR_CACHE_SIZE)
+	def color_argb(color):
+		"""Cor (ex.: "#RRGGBB" ou nome) como inteiro ARGB empacotado, com cache LRU.
+
+		As cenas usam poucas cores: a conversão via QColor acontece uma vez por
+		cor, e as escritas no buffer recebem o valor já empacotado.
+		"""
+		return QtGui.QColor(color).rgba()
 
 	def set_pixel(self, x, y, color):
 		"""Define a cor de um pixel no buffer, respeitando o recorte ativo."""
+		x, y = int(x), int(y)
+		if self.framebuffer is not None:
+			if self.framebuffer.set_pixel(x, y, self.color_argb(color), self.clip_bounds()):
+				self.damage(QtCore.QRect(x, y, 1, 1))
+			return
 		if 0 <= x < self.buffer.width() and 0 <= y < self.buffer.height():
 			if self.clip_rect is not None:
-				if not self.clip_rect.contains(int(x), int(y)):
+				if not self.clip_rect.contains(x, y):
 					return
-			col = QtGui.QColor(color)
-			self.buffer.setPixelColor(int(x), int(y), col)
-			self.update()
+			self.buffer.setPixel(x, y, self.color_argb(color))
+			self.damage(QtCore.QRect(x, y, 1, 1))
 
-	def clear(self, color='white'):
-		"""Limpa o buffer com a cor especificada."""
-		self.buffer.fill(QtGui.QColor(color))
-		self.update()
+	def set_pixels(self, xs, ys, color):
+		"""Define a cor de um lote de pixels (mesma cor) de uma só vez.
+
+		O retângulo de escrita (buffer ∩ recorte ativo) e a cor são resolvidos
+		uma única vez por lote, e só a região efetivamente pintada é marcada
+		para repintura (ver `damage`).
+		"""
+		if self.framebuffer is not None:
+			written = self.framebuffer.write(xs, ys, self.color_argb(color), self.clip_bounds())
+			if written is not None:
+				wx1, wy1, wx2, wy2 = written
+				self.damage(QtCore.QRect(wx1, wy1, wx2 - wx1 + 1, wy2 - wy1 + 1))
+			return
+		x1, y1 = 0, 0
+		x2, y2 = self.buffer.width() - 1, self.buffer.height() - 1
+		if self.clip_rect is not None:
+			x1 = max(x1, self.clip_rect.left()); x2 = min(x2, self.clip_rect.right())
+			y1 = max(y1, self.clip_rect.top()); y2 = min(y2, self.clip_rect.bottom())
+		if x1 > x2 or y1 > y2:
+			return
+		argb = self.color_argb(color)
+		# extremos dos pixels pintados; um único QRect no fim
+		px1 = py1 = None
+		for x, y in zip(xs, ys):
+			x = int(x); y = int(y)
+			if x1 <= x <= x2 and y1 <= y <= y2:
+				self.buffer.setPixel(x, y, argb)
+				if px1 is None:
+					px1 = px2 = x; py1 = py2 = y
+				else:
+					if x < px1: px1 = x
+					elif x > px2: px2 = x
+					if y < py1: py1 = y
+					elif y > py2: py2 = y
+		if px1 is not None:
+			self.damage(QtCore.QRect(px1, py1, px2 - px1 + 1, py2 - py1 + 1))
+
+	def clear(self, color='white', rect=None):
+		"""Limpa o buffer (ou apenas `rect`, em coords de buffer) com a cor especificada."""
+		if self.framebuffer is not None:
+			bounds = None if rect is None else (rect.left(), rect.top(), rect.right(), rect.bottom())
+			self.framebuffer.fill(self.color_argb(color), bounds)
+		elif rect is None:
+			self.buffer.fill(self.color_argb(color))
+		else:
+			painter = QtGui.QPainter(self.buffer)
+			painter.fillRect(rect, QtGui.QColor.fromRgba(self.color_argb(color)))
+			painter.end()
+		self.damage(rect)
 
 	def widget_to_buffer(self, x, y):
 		"""Converte coords do widget para coords do buffer lógico."""
@@ -143,9 +419,11 @@ class CanvasWidget(QtWidgets.QWidget):
 		return QtCore.QRect(x, y, max(1, w), max(1, h))
 
 	def set_clip_rect(self, rect_buf: QtCore.QRect | None):
-		"""Define o retângulo de recorte ativo (coords de buffer) ou limpa-o."""
+		"""Define o retângulo de recorte ativo (coords de buffer) ou limpa-o.
+
+		O recorte só limita escritas futuras; não há nada a repintar.
+		"""
 		self.clip_rect = rect_buf
-		self.update()
 
 	def set_pivot(self, bx=None, by=None):
 		"""Define o pivô em coords de buffer; passe None para limpar."""
@@ -153,7 +431,7 @@ class CanvasWidget(QtWidgets.QWidget):
 			self.pivot_point = None
 		else:
 			self.pivot_point = (int(bx), int(by))
-		self.update()
+		self.overlay_changed()
 
 	def mousePressEvent(self, event):
 		xw = event.position().x(); yw = event.position().y()
@@ -170,9 +448,110 @@ class CanvasWidget(QtWidgets.QWidget):
 		if event.button() == QtCore.Qt.MouseButton.LeftButton:
 			self.controller.on_canvas_release()
 
+class RenderThread(QtCore.QThread):
+	"""Rasteriza uma cena em um framebuffer próprio, fora da thread da interface.
+
+	Recebe `jobs`, uma lista de `(recorte, lotes)` já copiados da cena, e os
+	desenha em pedaços de `CHUNK` primitivas; `cancel()` interrompe o trabalho
+	entre um pedaço e outro. Ao terminar sem cancelamento emite `rendered`
+	com a geração do pedido e o framebuffer pronto.
+	"""
+
+	rendered = QtCore.pyqtSignal(int, object)
+
+	# primitivas por pedaço (granularidade do cancelamento)
+	CHUNK = 4096
+
+	def __init__(self, generation, framebuffer, jobs, algorithm, pool=None, parent=None):
+		super().__init__(parent)
+		self.generation = generation
+		self.framebuffer = framebuffer
+		self.jobs = jobs
+		self.algorithm = algorithm
+		self.pool = pool
+		self.cancelled = False
+
+	def cancel(self):
+		"""Pede a interrupção; o resultado parcial é descartado."""
+		self.cancelled = True
+
+	def run(self):
+		canvas = render.ArrayCanvas(self.framebuffer.width, self.framebuffer.height, framebuffer=self.framebuffer)
+		# com o pool, cada pedaço é dividido em blocos paralelos (pedaços maiores)
+		size = self.CHUNK * 16 if self.pool is not None else self.CHUNK
+		for clip, batches in self.jobs:
+			canvas.set_clip(clip)
+			for piece in render.chunked(batches, size):
+				if self.cancelled:
+					return
+				if self.pool is not None:
+					render.draw_batches_tiled([piece], self.framebuffer, self.algorithm, clip, self.pool)
+				else:
+					render.draw_batches([piece], self.algorithm, canvas)
+		if not self.cancelled:
+			self.rendered.emit(self.generation, self.framebuffer)
+
+
+class ProgressiveRender:
+	"""Redesenho na thread da interface, em pedaços limitados por um orçamento de tempo.
+
+	Percorre `jobs` (`[(recorte, lotes)]`) na ordem de desenho; cada `step`
+	entrega a `draw(recorte, lote)` pedaços dimensionados pela taxa medida
+	(primitivas/s) até esgotar o orçamento, e devolve True quando terminou.
+	Entre um passo e outro o chamador volta ao laço de eventos do Qt.
+	"""
+
+	# menor pedaço desenhado (primitivas), inclusive antes de haver medição
+	MIN_CHUNK = 64
+
+	def __init__(self, generation, jobs, draw):
+		self.generation = generation
+		self.pending = collections.deque((clip, batch) for clip, batches in jobs for batch in batches)
+		self.draw = draw
+		self.rate = None
+
+	def step(self, budget):
+		"""Desenha pedaços por até `budget` segundos; True quando não resta nada."""
+		deadline = time.perf_counter() + budget
+		while self.pending:
+			start = time.perf_counter()
+			if start >= deadline:
+				return False
+			size = self.MIN_CHUNK if self.rate is None else max(self.MIN_CHUNK, int(self.rate * (deadline - start)))
+			clip, (kind, data, codes, palette) = self.pending[0]
+			if size >= len(data):
+				self.pending.popleft()
+			else:
+				self.pending[0] = (clip, (kind, data[size:], codes[size:], palette))
+				data, codes = data[:size], codes[:size]
+			self.draw(clip, (kind, data, codes, palette))
+			elapsed = time.perf_counter() - start
+			if elapsed > 0:
+				self.rate = len(data) / elapsed
+		return True
+
+
 class MainWindow(QtWidgets.QMainWindow):
 	"""Janela principal: gerencia objetos, ferramentas, views e canvas."""
 
+	# pixels que a rasterização pode exceder da bbox dos vértices
+	RASTER_MARGIN = 1
+	# regiões pendentes por camada antes de descartá-la (redesenho completo)
+	MAX_LAYER_DAMAGE = 32
+	# maior resolução de buffer aceita em "Novo"
+	MAX_BUFFER = 8192
+	# acima desta resolução o canvas usa um framebuffer em blocos
+	TILED_ABOVE = 200
+	# primitivas a partir das quais um redesenho é rasterizado em blocos paralelos
+	PARALLEL_ABOVE = 50000
+	# threads da rasterização em blocos (opcional; 1 = sempre em série): o
+	# trabalho de cada bloco segura a GIL e, medido, fica mais lento que o serial
+	RENDER_WORKERS = 1
+	# primitivas a partir das quais um redesenho completo roda em segundo plano
+	BACKGROUND_ABOVE = 100000
+	# orçamento por quadro (s) do redesenho progressivo
+	FRAME_BUDGET = 0.008
+
 	def __init__(self):
 		super().__init__()
 		ui_path = self.resource_path(os.path.join('ui', 'editor.ui'))
@@ -181,18 +560,25 @@ class MainWindow(QtWidgets.QMainWindow):
 		# state
 		self.current_color = "#000000"
 		self.current_tool = 'point'
-		self.objects = []
+		# cena da raiz em estrutura de arrays; self.objects[i] devolve {'obj': view}
+		self.objects = SceneStore()
+		# índice espacial (bboxes) dos objetos da raiz, chaveado pelo índice em self.objects
+		self.spatial_index = UniformGrid()
 		self.selected_index = None
 		self.temp_points = []
 
 	# cria o canvas (buffer pequeno para evidenciar diferenças de raster)
-		self.canvas = CanvasWidget(self, buffer_width=80, buffer_height=80)
+		self.canvas = CanvasWidget(self, buffer_width=80, buffer_height=80, array_buffer=True)
 		Drawing.set_canvas(self.canvas)
 	# garante que o placeholder tenha um layout para hospedar o widget
 		if not hasattr(self.canvasPlaceholder, 'layout') or self.canvasPlaceholder.layout() is None:
 			self.canvasPlaceholder.setLayout(QtWidgets.QVBoxLayout())
 		self.canvasPlaceholder.layout().setContentsMargins(0,0,0,0)
 		self.canvasPlaceholder.layout().addWidget(self.canvas)
+	# contador de repinturas fixo na barra de status: as mensagens temporárias
+	# (ex.: "Renderizando...") não são sobrescritas a cada quadro do canvas
+		self.repaintsLabel = QtWidgets.QLabel()
+		self.statusBar().addPermanentWidget(self.repaintsLabel)
 
 	# conexões de UI
 		self.colorButton.clicked.connect(self.choose_color)
@@ -207,18 +593,38 @@ class MainWindow(QtWidgets.QMainWindow):
 		if hasattr(self, 'toolPivotBtn'):
 			self.toolPivotBtn.clicked.connect(lambda: self.set_tool('pivot'))
 		self.treeObjects.itemSelectionChanged.connect(self.on_tree_selection)
+		self.treeObjects.itemExpanded.connect(self.on_tree_expanded)
 	# checkbox da grade
 		if hasattr(self, 'showGridCheck'):
 			self.showGridCheck.setChecked(True)
 			self.showGridCheck.toggled.connect(lambda v: self.canvas.drawGrid(v))
+	# checkbox de composição (todas as views ao mesmo tempo)
+		self.compose_views = False
+		if hasattr(self, 'composeViewsCheck'):
+			self.composeViewsCheck.toggled.connect(self.set_compose_views)
+	# checkbox do redesenho progressivo (cenas grandes aparecem aos poucos)
+		self.progressive = False
+		if hasattr(self, 'progressiveCheck'):
+			self.progressiveCheck.toggled.connect(self.set_progressive)
 
 		# initial UI setup
 		self.set_tool('point')
 
 	# raiz da árvore e views
-		self.views = []  # [{'name': str, 'rect': QRect, 'objects': list}]
+		self.views = []  # [Viewport]: janelas que referenciam self.objects
 		self.active_view = None
 		self.selected_view_obj_index = None
+		# camadas raster em cache por conteúdo exibido (ver layer_key)
+		self.layers = {}
+		self.shown_layer = None
+		# rasterização em blocos paralelos (ver render_pool)
+		self.render_workers = self.RENDER_WORKERS
+		self._render_pool = None
+		# redesenho em segundo plano (ver render_in_background)
+		self.render_generation = 0
+		self.render_thread = None
+		self._render_threads = set()
+		self.progressive_render = None
 		self.treeObjects.clear()
 		root = QtWidgets.QTreeWidgetItem(["Canvas"])
 		root.setData(0, QtCore.Qt.ItemDataRole.UserRole, {'type': 'root'})
@@ -250,20 +656,25 @@ class MainWindow(QtWidgets.QMainWindow):
 
 	def action_new(self):
 		"""Cria um novo canvas solicitando resolução do buffer ao usuário."""
-		w, ok = QtWidgets.QInputDialog.getInt(self, 'Largura (pixels)', 'Largura (buffer):', 80, 4, 200)
+		w, ok = QtWidgets.QInputDialog.getInt(self, 'Largura (pixels)', 'Largura (buffer):', 80, 4, self.MAX_BUFFER)
 		if not ok: return
-		h, ok = QtWidgets.QInputDialog.getInt(self, 'Altura (pixels)', 'Altura (buffer):', 80, 4, 200)
+		h, ok = QtWidgets.QInputDialog.getInt(self, 'Altura (pixels)', 'Altura (buffer):', 80, 4, self.MAX_BUFFER)
 		if not ok: return
-		# recria o canvas com buffer lógico pequeno
+		# recria o canvas; buffers grandes usam blocos alocados sob demanda
+		self.cancel_render()
 		self.canvas.setParent(None)
-		self.canvas = CanvasWidget(self, buffer_width=w, buffer_height=h)
+		tiled = max(w, h) > self.TILED_ABOVE
+		self.canvas = CanvasWidget(self, buffer_width=w, buffer_height=h, array_buffer=True, tiled=tiled)
 		Drawing.set_canvas(self.canvas)
 		self.canvasPlaceholder.layout().addWidget(self.canvas)
 		self.canvas.clear()
 		self.objects.clear()
-		# reseta views e árvore
+		self.spatial_index.clear()
+		# reseta views, camadas e árvore
 		self.views = []
 		self.active_view = None
+		self.layers = {}
+		self.shown_layer = self.layer_key()
 		self.treeObjects.clear()
 		root = QtWidgets.QTreeWidgetItem(["Canvas"])
 		root.setData(0, QtCore.Qt.ItemDataRole.UserRole, {'type': 'root'})
@@ -277,8 +688,9 @@ class MainWindow(QtWidgets.QMainWindow):
 
 	def add_object(self, obj):
 		"""Adiciona um objeto à lista e à árvore de objetos."""
-		self.objects.append({'obj':obj})
-		idx = len(self.objects)-1
+		idx = self.objects.append(obj)
+		self.spatial_index.insert(idx, obj.bounds())
+		self.invalidate_layers(self.compute_bounding_rect({'obj': obj}))
 		label = obj.__class__.__name__ + f" #{idx}"
 		node = QtWidgets.QTreeWidgetItem([label])
 		node.setData(0, QtCore.Qt.ItemDataRole.UserRole, {'type': 'object', 'index': idx})
@@ -286,36 +698,266 @@ class MainWindow(QtWidgets.QMainWindow):
 		self.treeObjects.expandItem(self.tree_root)
 
 	def draw_objects(self, obj_list):
-		"""Desenha uma lista de objetos usando o algoritmo selecionado."""
-		for o in obj_list:
-			if isinstance(o, Point):
-				Drawing.paintPixel(int(o.x), int(o.y), o.color)
-			elif isinstance(o, Line):
-				if self.comboRender.currentText() == 'DDA':
-					DDA.rasterizeLine(o)
-				else:
-					BresenhamLines.rasterizeLine(o)
-			elif isinstance(o, Circle):
-				BresenhamCircle().rasterize(o)
-			elif isinstance(o, Polygon):
-				for ln in o.lines:
-					if self.comboRender.currentText() == 'DDA':
-						DDA.rasterizeLine(ln)
-					else:
-						BresenhamLines.rasterizeLine(ln)
+		"""Desenha uma lista de objetos (ou um `SceneStore`) com o algoritmo selecionado."""
+		if isinstance(obj_list, SceneStore):
+			self.draw_batches(obj_list.batches())
+		else:
+			self.draw_batches(scene_batches(obj_list))
+
+	def draw_batches(self, batches):
+		"""Rasteriza lotes `(tipo, dados, códigos, paleta)` na ordem recebida.
+
+		Sequências de pontos, retas e arestas de polígonos viram um lote de
+		segmentos (`LinesBatch`; um ponto é um segmento degenerado) e
+		sequências de círculos um lote de círculos, preservando a ordem de desenho.
+		Com `render_workers` > 1, cenas grandes são rasterizadas em blocos
+		paralelos (ver `render_pool`).
+		"""
+		algo = self.comboRender.currentText()
+		batches = list(batches)
+		pool = self.render_pool(sum(len(data) for _, data, _, _ in batches))
+		if pool is None or self.canvas.framebuffer is None:
+			render.draw_batches(batches, algo)
+			return
+		# blocos paralelos compostos no framebuffer; o widget só é avisado das regiões
+		fb = self.canvas.framebuffer
+		for x1, y1, x2, y2 in render.draw_batches_tiled(batches, fb, algo, self.canvas.writable_bounds(), pool):
+			self.canvas.damage(QtCore.QRect(x1, y1, x2 - x1 + 1, y2 - y1 + 1))
+
+	def render_pool(self, size):
+		"""Executor para rasterizar `size` primitivas em blocos paralelos, ou None (em série).
+
+		Desligado por padrão (`RENDER_WORKERS` = 1); quando habilitado, só
+		vale para cenas grandes e o pool de threads é criado na primeira vez.
+		"""
+		if size < self.PARALLEL_ABOVE or self.render_workers < 2:
+			return None
+		if self._render_pool is None:
+			self._render_pool = concurrent.futures.ThreadPoolExecutor(self.render_workers)
+		return self._render_pool
 
 	def collect_root_objects(self):
 		"""Retorna apenas os objetos da raiz (fora de views)."""
 		return [it['obj'] for it in self.objects]
 
+	def visible_views(self):
+		"""Views exibidas no canvas: todas (composição), a ativa, ou [None] para a raiz."""
+		if self.compose_views:
+			return list(self.views)
+		return [self.active_view]
+
+	def view_batches(self, view, box=None):
+		"""Lotes de rasterização do conteúdo de `view` (None = raiz) que intersecta `box`."""
+		if view is not None:
+			return scene_batches([o for _, o in view.objects(box)])
+		if box is None:
+			return self.objects.batches()
+		return self.objects.batches(self.spatial_index.query(box))
+
+	def draw_view(self, view, box=None):
+		"""Rasteriza o conteúdo de `view` (None = raiz) que intersecta `box`."""
+		self.draw_batches(self.view_batches(view, box))
+
+	def base_clip_rect(self):
+		"""Recorte do canvas fora dos redesenhos: a janela da view ativa (se única)."""
+		return None if self.compose_views else self.view_rect(self.active_view)
+
 	def redraw_all(self):
-		"""Limpa e redesenha a cena conforme a view ativa (se houver)."""
+		"""Limpa e redesenha a cena conforme a view ativa (ou todas, na composição).
+
+		Cenas grandes são rasterizadas em segundo plano (ver
+		`render_in_background`), com o canvas exibindo o quadro anterior até
+		o fim, ou, no modo progressivo, aos poucos (ver `render_progressively`).
+		"""
+		jobs = [(self.view_rect(view), list(self.view_batches(view))) for view in self.visible_views()]
+		if self.progressive:
+			if self.render_progressively(jobs):
+				return
+		elif self.render_in_background(jobs):
+			return
+		with self.canvas.painting():
+			self.canvas.clear()
+			for clip, batches in jobs:
+				self.canvas.set_clip_rect(clip)
+				self.draw_batches(batches)
+			self.canvas.set_clip_rect(self.base_clip_rect())
+
+	def render_in_background(self, jobs):
+		"""Dispara o redesenho completo `jobs` (`[(recorte, lotes)]`) numa `RenderThread`.
+
+		Qualquer redesenho em segundo plano ainda em andamento é cancelado. Só
+		cenas com pelo menos BACKGROUND_ABOVE primitivas vão para a thread;
+		retorna False quando nada foi disparado e o redesenho deve ser feito já.
+		"""
+		self.cancel_render()
+		fb = self.canvas.framebuffer
+		size = sum(len(data) for _, batches in jobs for _, data, _, _ in batches)
+		if fb is None or size < self.BACKGROUND_ABOVE:
+			return False
+		# a thread trabalha sobre cópias: a cena pode mudar enquanto ela roda
+		jobs = [(None if clip is None else self.rect_bounds(clip), [(k, d, c, list(p)) for k, d, c, p in batches])
+			for clip, batches in jobs]
+		self.render_generation += 1
+		target = type(fb)(fb.width, fb.height, self.canvas.color_argb('white'))
+		thread = RenderThread(self.render_generation, target, jobs, self.comboRender.currentText(), self.render_pool(size))
+		thread.rendered.connect(self.on_background_rendered)
+		thread.finished.connect(lambda: self._render_threads.discard(thread))
+		self._render_threads.add(thread)
+		self.render_thread = thread
+		thread.start()
+		self.statusBar().showMessage('Renderizando...')
+		return True
+
+	def render_progressively(self, jobs):
+		"""Redesenha `jobs` (`[(recorte, lotes)]`) aos poucos, sem travar a interface.
+
+		O canvas é limpo já e cada passo desenha o que couber em FRAME_BUDGET,
+		agendando o próximo pelo laço de eventos; os resultados parciais
+		aparecem a cada passo. Um redesenho mais novo interrompe este. Como em
+		`render_in_background`, só cenas grandes são tratadas assim; retorna
+		False quando o redesenho deve ser feito já.
+		"""
+		self.cancel_render()
+		if sum(len(data) for _, batches in jobs for _, data, _, _ in batches) < self.BACKGROUND_ABOVE:
+			return False
+		self.render_generation += 1
+		self.progressive_render = ProgressiveRender(self.render_generation, jobs, self.draw_piece)
 		self.canvas.clear()
-		self.canvas.set_clip_rect(self.active_view['rect'] if self.active_view else None)
-		if self.active_view:
-			self.draw_objects(self.active_view['objects'])
+		self.statusBar().showMessage('Renderizando...')
+		self.progressive_step(self.render_generation)
+		return True
+
+	def draw_piece(self, clip, batch):
+		"""Rasteriza um lote do redesenho progressivo com o recorte `clip` (QRect ou None)."""
+		self.canvas.set_clip_rect(clip)
+		self.draw_batches([batch])
+
+	def progressive_step(self, generation):
+		"""Um passo do redesenho progressivo `generation`; reagenda-se até terminar."""
+		job = self.progressive_render
+		if job is None or job.generation != generation:
+			return
+		with self.canvas.painting():
+			done = job.step(self.FRAME_BUDGET)
+			self.canvas.set_clip_rect(self.base_clip_rect())
+		if done:
+			self.progressive_render = None
+			self.statusBar().clearMessage()
 		else:
-			self.draw_objects(self.collect_root_objects())
+			QtCore.QTimer.singleShot(0, lambda: self.progressive_step(generation))
+
+	def render_pending(self):
+		"""Há um redesenho (em segundo plano ou progressivo) ainda em andamento?"""
+		return self.render_thread is not None or self.progressive_render is not None
+
+	def cancel_render(self):
+		"""Cancela o redesenho em segundo plano ou progressivo pendente, se houver."""
+		if self.render_thread is not None:
+			self.render_thread.cancel()
+			self.render_thread = None
+		self.progressive_render = None
+
+	def on_background_rendered(self, generation, framebuffer):
+		"""Troca o conteúdo do canvas pelo quadro pronto, se ele ainda for o pedido mais recente."""
+		if generation != self.render_generation or self.render_thread is None:
+			return
+		self.render_thread = None
+		fb = self.canvas.framebuffer
+		if fb is None or (fb.width, fb.height) != (framebuffer.width, framebuffer.height):
+			return
+		with self.canvas.painting():
+			fb.blit(framebuffer.snapshot())
+			self.canvas.damage()
+			self.canvas.set_clip_rect(self.base_clip_rect())
+		self.statusBar().clearMessage()
+
+	def closeEvent(self, event):
+		"""Interrompe redesenhos em segundo plano antes de fechar a janela."""
+		self.cancel_render()
+		for thread in list(self._render_threads):
+			thread.wait()
+		super().closeEvent(event)
+
+	def redraw_rect(self, rect_buf):
+		"""Redesenha apenas a região `rect_buf` (coords de buffer).
+
+		Limpa a região e rasteriza de novo somente os objetos cuja bbox a
+		intersecta, com a escrita limitada à região (e à janela de cada view).
+		"""
+		if rect_buf is None or rect_buf.isEmpty():
+			return
+		if self.render_pending():
+			# o quadro em preparo já está desatualizado: refaz a cena toda
+			self.redraw_all()
+			return
+		# o DDA trunca coordenadas acumuladas em float e pode pintar 1 pixel
+		# fora da bbox dos vértices; a região e as bboxes levam essa margem
+		m = self.RASTER_MARGIN
+		rect_buf = rect_buf.adjusted(-m, -m, m, m)
+		# bbox (+m) intersecta a região  <=>  bbox intersecta a região (+m)
+		query = self.rect_bounds(rect_buf.adjusted(-m, -m, m, m))
+		with self.canvas.painting():
+			self.canvas.clear(rect=rect_buf)
+			for view in self.visible_views():
+				view_rect = self.view_rect(view)
+				clip = rect_buf.intersected(view_rect) if view_rect else rect_buf
+				if clip.isEmpty():
+					continue
+				self.canvas.set_clip_rect(clip)
+				self.draw_view(view, query)
+			self.canvas.set_clip_rect(self.base_clip_rect())
+
+	def layer_key(self):
+		"""Chave da camada exibida: 'composite', a view ativa ou None (raiz)."""
+		return 'composite' if self.compose_views else self.active_view
+
+	def invalidate_layers(self, rect_buf=None):
+		"""Marca `rect_buf` como desatualizado nas camadas em cache (todas se None).
+
+		A camada exibida é redesenhada por quem altera a cena; as demais só
+		acumulam as regiões, redesenhadas quando voltarem a ser exibidas.
+		"""
+		for key in list(self.layers):
+			damage = self.layers[key]['damage']
+			if rect_buf is None or len(damage) >= self.MAX_LAYER_DAMAGE:
+				del self.layers[key]
+			elif not rect_buf.isEmpty():
+				damage.append(QtCore.QRect(rect_buf))
+
+	def show_layer(self):
+		"""Exibe a camada de `layer_key()`: um blit da cópia em cache, se houver.
+
+		A camada que sai de cena é guardada; na que entra só as regiões
+		invalidadas desde então são rasterizadas de novo.
+		"""
+		key = self.layer_key()
+		if key == self.shown_layer:
+			return
+		fb = self.canvas.framebuffer
+		# com um redesenho pendente o buffer não está pronto para guardar
+		if fb is not None and not self.render_pending():
+			self.layers[self.shown_layer] = {'pixels': fb.snapshot(), 'damage': []}
+		self.cancel_render()
+		self.shown_layer = key
+		layer = self.layers.pop(key, None)
+		if layer is None or fb is None:
+			self.redraw_all()
+			return
+		with self.canvas.painting():
+			fb.blit(layer['pixels'])
+			self.canvas.damage()
+			self.canvas.set_clip_rect(self.base_clip_rect())
+			for rect in layer['damage']:
+				self.redraw_rect(rect)
+
+	def set_progressive(self, enabled):
+		"""Liga/desliga o redesenho progressivo de cenas grandes."""
+		self.progressive = bool(enabled)
+
+	def set_compose_views(self, enabled):
+		"""Liga/desliga a composição de todas as views no canvas."""
+		self.compose_views = bool(enabled)
+		self.show_layer()
 
 	def on_tree_selection(self):
 		"""Atualiza seleção (raiz/view/objeto) a partir da árvore."""
@@ -325,6 +967,7 @@ class MainWindow(QtWidgets.QMainWindow):
 		data = item.data(0, QtCore.Qt.ItemDataRole.UserRole)
 		if not data:
 			return
+		prev_view = self.active_view
 		if data['type'] == 'root':
 			self.active_view = None
 			self.selected_index = None
@@ -342,50 +985,69 @@ class MainWindow(QtWidgets.QMainWindow):
 			self.selected_index = data['index']
 			self.active_view = None
 			self.selected_view_obj_index = None
-		self.redraw_all()
+		# só a troca de view muda os pixels; a seleção é apenas sobreposição
+		if self.active_view is not prev_view:
+			self.show_layer()
+		else:
+			self.canvas.update()
 
 	def get_selected_rect_buf(self):
 		"""Retorna o retângulo (buffer) do item atualmente selecionado."""
 		if self.selected_index is not None:
 			return self.compute_bounding_rect(self.objects[self.selected_index])
 		if self.active_view and self.selected_view_obj_index is not None:
-			obj = self.active_view['objects'][self.selected_view_obj_index]
-			return self.compute_bounding_rect({'obj': obj})
+			obj, = self.active_view.clipped([self.selected_view_obj_index])
+			return self.compute_bounding_rect({'obj': obj}) if obj is not None else None
 		return None
 
 	def compute_bounding_rect(self, item):
-		"""Calcula o QRect (coords de buffer) que envolve o item dado."""
-		item = item['obj'] 
-		xs, ys = [], []
-		if isinstance(item, Point):
-			xs = [item.x, item.x]
-			ys = [item.y, item.y]
-		elif isinstance(item, Line):
-			xs = [item.pointA.x, item.pointB.x]
-			ys = [item.pointA.y, item.pointB.y]
-		elif isinstance(item, Circle):
-			xs = [item.center.x - item.radius, item.center.x + item.radius]
-			ys = [item.center.y - item.radius, item.center.y + item.radius]
-		elif isinstance(item, Polygon):
-			for ln in item.lines:
-				xs += [ln.pointA.x, ln.pointB.x]
-				ys += [ln.pointA.y, ln.pointB.y]
-		if not xs: return None
-		x1, x2 = int(min(xs)), int(max(xs))
-		y1, y2 = int(min(ys)), int(max(ys))
-		return QtCore.QRect(x1, y1, x2 - x1 + 1, y2 - y1 + 1)
+		"""Calcula o QRect (coords de buffer) que envolve o item dado.
+
+		Usa a bbox em cache do objeto (`Drawing.bounds`).
+		"""
+		b = item['obj'].bounds()
+		if b is None: return None
+		return QtCore.QRect(b[0], b[1], b[2] - b[0] + 1, b[3] - b[1] + 1)
+
+	@staticmethod
+	def rect_bounds(rect):
+		"""Converte um QRect em tupla inclusiva (x1, y1, x2, y2), ou None."""
+		if rect is None:
+			return None
+		return rect.left(), rect.top(), rect.right(), rect.bottom()
 
 	def compute_bounding_rect_buf(self, item):
 		"""Alias de compute_bounding_rect (coords já em buffer)."""
 		return self.compute_bounding_rect(item)
 
+	def show_new_object(self, obj, paint):
+		"""Exibe um objeto recém-adicionado.
+
+		Na raiz `paint()` o rasteriza por cima do que já existe; numa view (que
+		recorta pelo algoritmo escolhido) ou na composição, a região do objeto
+		é redesenhada. Com um redesenho ainda pendente (em segundo plano ou
+		progressivo), ele é refeito já incluindo o objeto.
+		"""
+		with self.canvas.painting():
+			if self.render_pending():
+				self.redraw_all()
+			elif self.layer_key() is None:
+				paint()
+			else:
+				self.redraw_rect(self.compute_bounding_rect({'obj': obj}))
+
+	def on_canvas_frame_end(self):
+		"""Mostra na barra de status quantas repinturas os quadros do canvas evitaram."""
+		if hasattr(self, 'repaintsLabel'):
+			self.repaintsLabel.setText(f'Repinturas economizadas: {self.canvas.updates_saved}')
+
 	def on_canvas_left_click(self, x, y):
 		"""Trata cliques com botão esquerdo no canvas (desenho e seleção)."""
 		bx, by = self.canvas.widget_to_buffer(x, y)
 		if self.current_tool == 'point':
 			p = Point(bx, by, self.current_color)
 			self.add_object(p)
-			Drawing.paintPixel(p.x, p.y, p.color)
+			self.show_new_object(p, lambda: Drawing.paintPixel(p.x, p.y, p.color))
 		elif self.current_tool == 'line':
 			self.temp_points.append((bx,by))
 			if len(self.temp_points) == 2:
@@ -393,10 +1055,8 @@ class MainWindow(QtWidgets.QMainWindow):
 				b = Point(*self.temp_points[1])
 				l = Line(a,b, self.current_color)
 				self.add_object(l)
-				if self.comboRender.currentText() == 'DDA':
-					DDA().rasterizeLine(line=l)
-				else:
-					BresenhamLines().rasterizeLine(line=l)
+				rasterizer = DDA() if self.comboRender.currentText() == 'DDA' else BresenhamLines()
+				self.show_new_object(l, lambda: rasterizer.rasterizeLine(line=l))
 				self.temp_points = []
 		elif self.current_tool == 'circle':
 			self.temp_points.append((bx,by))
@@ -406,7 +1066,7 @@ class MainWindow(QtWidgets.QMainWindow):
 				r = int(((cx-x2)**2 + (cy-y2)**2)**0.5)
 				c = Circle(Point(cx,cy), r, self.current_color)
 				self.add_object(c)
-				BresenhamCircle().rasterize(c)
+				self.show_new_object(c, lambda: BresenhamCircle().rasterize(c))
 				self.temp_points = []
 		elif self.current_tool == 'polygon':
 			# adiciona ponto; espera retorno próximo à origem para fechar
@@ -414,18 +1074,9 @@ class MainWindow(QtWidgets.QMainWindow):
 			if len(self.temp_points) > 1 and (abs(bx - self.temp_points[0][0]) < 3 and abs(by - self.temp_points[0][1]) < 3 and len(self.temp_points) > 2):
 				# fecha o polígono
 				pts = self.temp_points[:-1]
-				lines = []
-				for i in range(len(pts)):
-					a = Point(*pts[i])
-					b = Point(*pts[(i+1)%len(pts)])
-					lines.append(Line(a,b, self.current_color))
-				poly = Polygon(lines)
+				poly = Polygon.fromVertices(pts, self.current_color)
 				self.add_object(poly)
-				for ln in lines:
-					if self.comboRender.currentText() == 'DDA':
-						DDA().rasterizeLine(ln)
-					else:
-						BresenhamLines().rasterizeLine(ln)
+				self.show_new_object(poly, lambda: self.draw_objects([poly]))
 				self.temp_points = []
 		elif self.current_tool == 'clip':
 			# inicia o retângulo de seleção em coords de widget
@@ -445,9 +1096,9 @@ class MainWindow(QtWidgets.QMainWindow):
 		item_wrapper = None
 		# 1) objeto de view selecionado
 		if self.active_view and self.selected_view_obj_index is not None:
-			obj = self.active_view['objects'][self.selected_view_obj_index]
+			obj, = self.active_view.clipped([self.selected_view_obj_index])
 			item_wrapper = {'obj': obj}
-			rect = self.compute_bounding_rect(item_wrapper)
+			rect = self.compute_bounding_rect(item_wrapper) if obj is not None else None
 			if rect and rect.contains(bx, by):
 				target_kind = 'view'
 				target_index = self.selected_view_obj_index
@@ -458,27 +1109,24 @@ class MainWindow(QtWidgets.QMainWindow):
 			if rect and rect.contains(bx, by):
 				target_kind = 'root'
 				target_index = self.selected_index
-		# 3) hit-test nos objetos da view ativa
+		# 3) hit-test nos objetos da view ativa (primeiro em ordem de desenho)
 		elif self.active_view:
-			for i, vo in enumerate(self.active_view['objects']):
-				wrap = {'obj': vo}
-				rect = self.compute_bounding_rect(wrap)
-				if rect and rect.contains(bx, by):
-					self.selected_view_obj_index = i
-					item_wrapper = wrap
-					target_kind = 'view'
-					target_index = i
-					break
+			hits = self.active_view.query_point(bx, by)
+			if hits:
+				i = hits[0]
+				self.selected_view_obj_index = i
+				item_wrapper = self.objects[i]
+				target_kind = 'view'
+				target_index = i
 		# 4) hit-test nos objetos da raiz
 		else:
-			for i, it in enumerate(self.objects):
-				rect = self.compute_bounding_rect(it)
-				if rect and rect.contains(bx, by):
-					self.selected_index = i
-					item_wrapper = it
-					target_kind = 'root'
-					target_index = i
-					break
+			hits = self.spatial_index.query_point(bx, by)
+			if hits:
+				i = hits[0]
+				self.selected_index = i
+				item_wrapper = self.objects[i]
+				target_kind = 'root'
+				target_index = i
 
 		if target_kind is None or item_wrapper is None:
 			return
@@ -534,185 +1182,117 @@ class MainWindow(QtWidgets.QMainWindow):
 			self.canvas.drag_select_start = None
 			self.canvas.drag_select_end = None
 	def create_view(self, rect_buf: QtCore.QRect):
-		"""Cria uma view contendo objetos recortados pelo algoritmo escolhido."""
-		algo = self.comboClipping.currentText()
-		view_objects = []
-		for it in self.objects:
-			obj = it['obj']
-			clipper = ClippingCS(rect_buf.left(), rect_buf.right(), rect_buf.top(), rect_buf.bottom()) if algo == 'Cohen-Sutherland' else ClippingLB(rect_buf.left(), rect_buf.right(), rect_buf.top(), rect_buf.bottom())
-			if isinstance(obj, Point):
-				if rect_buf.contains(int(obj.x), int(obj.y)):
-					view_objects.append(Point(obj.x, obj.y, obj.color))
-			elif isinstance(obj, Line):
-				cl = clipper.clip_line(obj)
-				if cl is not None:
-					view_objects.append(Line(cl.pointA, cl.pointB, obj.color))
-			elif isinstance(obj, Circle):
-				# inclusão simples se a bbox intersecta
-				xs = [obj.center.x - obj.radius, obj.center.x + obj.radius]
-				ys = [obj.center.y - obj.radius, obj.center.y + obj.radius]
-				cb = QtCore.QRect(min(xs), min(ys), abs(xs[1]-xs[0])+1, abs(ys[1]-ys[0])+1)
-				if rect_buf.intersects(cb):
-					view_objects.append(Circle(Point(obj.center.x, obj.center.y), obj.radius, obj.color))
-			elif isinstance(obj, Polygon):
-				clipped_lines = []
-				for ln in obj.lines:
-					cl = clipper.clip_line(ln)
-					if cl is not None:
-						clipped_lines.append(Line(cl.pointA, cl.pointB, ln.color))
-				if clipped_lines:
-					view_objects.append(Polygon(clipped_lines))
-		# register view in tree
+		"""Cria uma view que referencia a cena e a recorta sob demanda.
+
+		Nada é copiado nem recortado aqui: a view guarda só a janela e o
+		algoritmo de recorte escolhido; os recortes são feitos (e guardados em
+		cache) quando a view é desenhada.
+		"""
 		name = f"Viewport {len(self.views)+1}"
-		view = {'name': name, 'rect': rect_buf, 'objects': view_objects}
+		view = Viewport(name, self.rect_bounds(rect_buf), self.objects, self.spatial_index,
+			self.comboClipping.currentText())
 		self.views.append(view)
+		# a nova janela muda a composição; as demais camadas não mudam
+		self.layers.pop('composite', None)
 		node = QtWidgets.QTreeWidgetItem([name])
 		node.setData(0, QtCore.Qt.ItemDataRole.UserRole, {'type': 'view', 'ref': view})
+		# os filhos são listados ao expandir o nó (on_tree_expanded)
+		node.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
 		self.tree_root.addChild(node)
-		# add children for view objects
-		for i, vo in enumerate(view_objects):
-			label = vo.__class__.__name__ + f" #{i}"
-			child = QtWidgets.QTreeWidgetItem([label])
+		# ativa a view (on_tree_selection troca a camada exibida)
+		self.treeObjects.setCurrentItem(node)
+		if self.compose_views:
+			self.redraw_rect(rect_buf)
+
+	def on_tree_expanded(self, node):
+		"""Lista, ao expandir uma view, os objetos visíveis nela no momento."""
+		data = node.data(0, QtCore.Qt.ItemDataRole.UserRole)
+		if not data or data['type'] != 'view':
+			return
+		view = data['ref']
+		node.takeChildren()
+		for i, vo in view.objects():
+			child = QtWidgets.QTreeWidgetItem([vo.__class__.__name__ + f" #{i}"])
 			child.setData(0, QtCore.Qt.ItemDataRole.UserRole, {'type': 'view-object', 'view': view, 'index': i})
 			node.addChild(child)
-		self.treeObjects.expandItem(node)
-		# activate view
-		self.active_view = view
-		self.treeObjects.setCurrentItem(node)
-		self.redraw_all()
+
+	def view_rect(self, view):
+		"""Janela da view como QRect (coords de buffer), ou None sem view."""
+		if view is None:
+			return None
+		x1, y1, x2, y2 = view.window
+		return QtCore.QRect(x1, y1, x2 - x1 + 1, y2 - y1 + 1)
+
+	def transform_target(self, idx):
+		"""Resolve o alvo de uma transformação: (wrapper, índice espacial, chave).
+
+		Com `idx=None` e um objeto de view selecionado, o alvo é o objeto da
+		cena que ele referencia; caso contrário, o objeto `idx` da raiz.
+		"""
+		if self.active_view and self.selected_view_obj_index is not None and idx is None:
+			idx = self.selected_view_obj_index
+		return self.objects[idx], self.spatial_index, idx
+
+	def commit_transform(self, target, index, key, old_rect):
+		"""Invalida a bbox e os recortes em cache do alvo, reindexa-o e redesenha a região afetada."""
+		target['obj'].invalidate()
+		for view in self.views:
+			view.invalidate(key)
+		new_rect = self.compute_bounding_rect(target)
+		index.update(key, target['obj'].bounds())
+		damage = old_rect.united(new_rect) if new_rect else old_rect
+		self.invalidate_layers(damage)
+		self.redraw_rect(damage)
+
+	def transform_pivot(self, obj):
+		"""Pivô das transformações: o definido pelo usuário ou o centro dos vértices.
+
+		O centro vem das coordenadas float do modelo, não da bbox em pixels,
+		para que sequências de transformações não acumulem o arredondamento.
+		"""
+		if self.canvas.pivot_point is not None:
+			return self.canvas.pivot_point
+		pts = Transformations.vertices(obj)
+		cx, cy = (pts.min(axis=0) + pts.max(axis=0)) / 2
+		return float(cx), float(cy)
 
 	def apply_translation(self, idx, dx, dy):
 		"""Aplica translação ao objeto alvo (na view ativa ou na raiz)."""
-		if self.active_view and self.selected_view_obj_index is not None and idx is None:
-			obj = self.active_view['objects'][self.selected_view_obj_index]
-			target = {'obj': obj}
-		else:
-			target = self.objects[idx]
-		item = target['obj']
-		if isinstance(item,Point):
-			item.x,item.y = Transformations.translate(item.x, item.y, dx, dy)
-		elif isinstance(item,Line):
-			item.pointA.x,item.pointA.y = Transformations.translate(item.pointA.x,item.pointA.y, dx, dy)
-			item.pointB.x,item.pointB.y = Transformations.translate(item.pointB.x,item.pointB.y, dx, dy)
-		elif isinstance(item,Circle):
-			item.center.x,item.center.y = Transformations.translate(item.center.x, item.center.y, dx, dy)
-		elif isinstance(item,Polygon):
-			for ln in item.lines:
-				ln.pointA.x,ln.pointA.y = Transformations.translate(ln.pointA.x,ln.pointA.y, dx, dy)
-				ln.pointB.x,ln.pointB.y = Transformations.translate(ln.pointB.x,ln.pointB.y, dx, dy)
-		self.redraw_all()
+		target, index, key = self.transform_target(idx)
+		old_rect = self.compute_bounding_rect(target)
+		Transformations.transformObjects([target['obj']], Transformations.translationMatrix(dx, dy))
+		self.commit_transform(target, index, key, old_rect)
 
 	def apply_rotation(self, idx, angle_deg):
 		"""Aplica rotação (em graus) ao redor do pivô ou centro da bbox."""
-		if self.active_view and self.selected_view_obj_index is not None and idx is None:
-			target = {'obj': self.active_view['objects'][self.selected_view_obj_index]}
-		else:
-			target = self.objects[idx]
-		item = target
-		rect = self.compute_bounding_rect(item)
-		item = item['obj']
-		
+		target, index, key = self.transform_target(idx)
+		rect = self.compute_bounding_rect(target)
 		if not rect: return
-		# usa pivô se definido; senão, centro da bbox
-		if self.canvas.pivot_point is not None:
-			cx, cy = self.canvas.pivot_point
-		else:
-			cx = rect.x() + rect.width()/2
-			cy = rect.y() + rect.height()/2
-
-		# rotaciona ao redor do ponto (cx, cy)
-		def rot_point(px,py):
-			nx = px - cx; ny = py - cy
-			rx, ry = Transformations.rotate(nx, ny, angle_deg)
-			return round(rx + cx + 0.000001), round(ry + cy + 0.000001)
-
-		if isinstance(item,Point):
-			item.x, item.y = rot_point(item.x, item.y)
-		elif isinstance(item,Line):
-			item.pointA.x, item.pointA.y = rot_point(item.pointA.x, item.pointA.y)
-			item.pointB.x, item.pointB.y = rot_point(item.pointB.x, item.pointB.y)
-		elif isinstance(item,Circle):
-			item.center.x, item.center.y = rot_point(item.center.x, item.center.y)
-		elif isinstance(item,Polygon):
-			for ln in item.lines:
-				ln.pointA.x, ln.pointA.y = rot_point(ln.pointA.x, ln.pointA.y)
-				ln.pointB.x, ln.pointB.y = rot_point(ln.pointB.x, ln.pointB.y)
-		self.redraw_all()
+		Transformations.transformObjects([target['obj']], Transformations.rotationMatrix(angle_deg),
+			pivot=self.transform_pivot(target['obj']))
+		self.commit_transform(target, index, key, rect)
 
 	def apply_scale(self, idx, sx, sy):
 		"""Aplica escala em torno do pivô ou centro da bbox (sx, sy)."""
-		if self.active_view and self.selected_view_obj_index is not None and idx is None:
-			target = {'obj': self.active_view['objects'][self.selected_view_obj_index]}
-		else:
-			target = self.objects[idx]
-		item = target
-		rect = self.compute_bounding_rect(item)
+		target, index, key = self.transform_target(idx)
+		rect = self.compute_bounding_rect(target)
 		if not rect: return
-		# usa pivô se definido; senão, centro da bbox
-		if self.canvas.pivot_point is not None:
-			cx, cy = self.canvas.pivot_point
-		else:
-			cx = rect.x() + rect.width()/2
-			cy = rect.y() + rect.height()/2
-
-		# escala ao redor do ponto (cx, cy)
-		def sc(px,py):
-			nx = px - cx; ny = py - cy
-			rx, ry = Transformations.scale(nx, ny, sx, sy)
-			return round(rx + cx + 0.000001), round(ry + cy + 0.000001)
-		
-		obj = item['obj']
-		if isinstance(obj,Point):
-			obj.x, obj.y = sc(obj.x, obj.y)
-		elif isinstance(obj,Line):
-			obj.pointA.x, obj.pointA.y = sc(obj.pointA.x, obj.pointA.y)
-			obj.pointB.x, obj.pointB.y = sc(obj.pointB.x, obj.pointB.y)
-
-		elif isinstance(obj,Circle):
-			obj.center.x, obj.center.y = sc(obj.center.x, obj.center.y)
-			obj.radius = int(obj.radius * (sx+sy)/2)
-		elif isinstance(obj,Polygon):
-			for ln in obj.lines:
-				ln.pointA.x, ln.pointA.y = sc(ln.pointA.x, ln.pointA.y)
-				ln.pointB.x, ln.pointB.y = sc(ln.pointB.x, ln.pointB.y)
-		self.redraw_all()
+		obj = target['obj']
+		Transformations.transformObjects([obj], Transformations.scaleMatrix(sx, sy),
+			pivot=self.transform_pivot(obj))
+		if isinstance(obj,Circle):
+			obj.radius = obj.radius * (sx+sy)/2
+		self.commit_transform(target, index, key, rect)
 
 	#TODO: select a point in the object as reflect origin
 	def apply_reflect(self, idx, axis):
 		"""Reflete em torno do pivô ou centro da bbox (eixos: 'x', 'y' ou 'yx')."""
-		if self.active_view and self.selected_view_obj_index is not None and idx is None:
-			target = {'obj': self.active_view['objects'][self.selected_view_obj_index]}
-		else:
-			target = self.objects[idx]
-		item = target
-		rect = self.compute_bounding_rect(item)
+		target, index, key = self.transform_target(idx)
+		rect = self.compute_bounding_rect(target)
 		if not rect: return
-		# usa pivô se definido; senão, centro da bbox
-		if self.canvas.pivot_point is not None:
-			cx, cy = self.canvas.pivot_point
-		else:
-			cx = rect.x() + rect.width()/2
-			cy = rect.y() + rect.height()/2
-		item = item['obj']
-
-		# reflexão ao redor do ponto (cx, cy)
-		def rft(px, py, axis):
-			nx = px - cx; ny = py - cy
-			rx, ry = Transformations.reflect(nx, ny, axis)
-			return round(rx + cx + 0.000001), round(ry + cy + 0.000001)
-
-		if isinstance(item,Point):
-			item.x,item.y = rft(item.x, item.y, axis=axis)
-		elif isinstance(item,Line):
-			item.pointA.x,item.pointA.y = rft(item.pointA.x,item.pointA.y, axis=axis)
-			item.pointB.x,item.pointB.y = rft(item.pointB.x,item.pointB.y, axis=axis)
-		elif isinstance(item,Circle):
-			item.center.x,item.center.y = rft(item.center.x, item.center.y,axis=axis)
-		elif isinstance(item,Polygon):
-			for ln in item.lines:
-				ln.pointA.x, ln.pointA.y = rft(ln.pointA.x, ln.pointA.y, axis=axis)
-				ln.pointB.x, ln.pointB.y = rft(ln.pointB.x, ln.pointB.y, axis=axis)
-		self.redraw_all()
+		Transformations.transformObjects([target['obj']], Transformations.reflectionMatrix(axis),
+			pivot=self.transform_pivot(target['obj']))
+		self.commit_transform(target, index, key, rect)
 
 def main():
 	"""Ponto de entrada da aplicação."""
@@ -0,0 +1,77 @@
+"""Equivalência entre `TiledFramebuffer` e `ArrayFramebuffer`.
+
+As mesmas operações aleatórias (escritas em lote, pixels soltos, preenchimentos
+e colagens, com e sem recorte) são aplicadas aos dois buffers, que devem
+terminar com os mesmos pixels.
+"""
+
+import random
+
+import numpy as np
+
+from utils.framebuffer import ArrayFramebuffer, TiledFramebuffer
+
+
+class SmallTiles(TiledFramebuffer):
+    """Blocos pequenos para que as operações cruzem muitas bordas de bloco."""
+
+    TILE = 8
+
+
+COLORS = [0xFFFFFFFF, 0xFF000000, 0xFFFF0000, 0xFF00FF00]
+
+
+def random_rect(rng, width, height):
+    """Retângulo inclusivo que pode sair do buffer (ou ser vazio)."""
+    x1, y1 = rng.randint(-5, width + 5), rng.randint(-5, height + 5)
+    return x1, y1, x1 + rng.randint(-2, width), y1 + rng.randint(-2, height)
+
+
+def apply_random_ops(rng, buffers, width, height, steps=300):
+    for _ in range(steps):
+        op = rng.choice(['write', 'set_pixel', 'fill', 'fill_all', 'paste'])
+        argb = rng.choice(COLORS)
+        clip = random_rect(rng, width, height) if rng.random() < 0.5 else None
+        if op == 'write':
+            n = rng.randint(0, 60)
+            xs = [rng.randint(-3, width + 2) for _ in range(n)]
+            ys = [rng.randint(-3, height + 2) for _ in range(n)]
+            results = [fb.write(xs, ys, argb, clip) for fb in buffers]
+        elif op == 'set_pixel':
+            x, y = rng.randint(-2, width + 1), rng.randint(-2, height + 1)
+            results = [fb.set_pixel(x, y, argb, clip) for fb in buffers]
+        elif op == 'fill':
+            rect = random_rect(rng, width, height)
+            results = [fb.fill(argb, rect) for fb in buffers]
+        elif op == 'fill_all':
+            results = [fb.fill(argb) for fb in buffers]
+        else:
+            w, h = rng.randint(1, width), rng.randint(1, height)
+            x1, y1 = rng.randint(0, width - w), rng.randint(0, height - h)
+            pixels = np.array([[rng.choice(COLORS) for _ in range(w)] for _ in range(h)], dtype=np.uint32)
+            results = [fb.paste((x1, y1, x1 + w - 1, y1 + h - 1), pixels) for fb in buffers]
+        assert all(r == results[0] for r in results), op
+        rect = random_rect(rng, width, height)
+        expected = buffers[0].to_array(rect)
+        for fb in buffers[1:]:
+            np.testing.assert_array_equal(fb.to_array(rect), expected)
+
+
+def test_tiled_matches_array_framebuffer():
+    rng = random.Random(20)
+    for width, height in [(37, 29), (64, 16), (1, 1), (300, 270)]:
+        buffers = [ArrayFramebuffer(width, height), SmallTiles(width, height), TiledFramebuffer(width, height)]
+        apply_random_ops(rng, buffers, width, height)
+        for fb in buffers[1:]:
+            np.testing.assert_array_equal(fb.to_array(), buffers[0].to_array())
+
+
+def test_tiled_snapshot_restores_layer():
+    rng = random.Random(21)
+    dense, tiled = ArrayFramebuffer(40, 30), SmallTiles(40, 30)
+    apply_random_ops(rng, [dense, tiled], 40, 30, steps=50)
+    saved_dense, saved_tiled = dense.snapshot(), tiled.snapshot()
+    apply_random_ops(rng, [dense, tiled], 40, 30, steps=50)
+    dense.blit(saved_dense)
+    tiled.blit(saved_tiled)
+    np.testing.assert_array_equal(tiled.to_array(), dense.to_array())
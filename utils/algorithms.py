@@ -3,17 +3,30 @@
 Contém implementações simples e didáticas de:
 - Transformações 2D (translação, escala, rotação, reflexão);
 - Rasterização de linhas (DDA, Bresenham) e de círculos (Bresenham);
-- Recorte de linhas (Cohen–Sutherland e Liang–Barsky).
+- Recorte de linhas (Cohen–Sutherland e Liang–Barsky) e de polígonos
+  (Sutherland–Hodgman);
+- Rasterização vetorizada (NumPy) de muitos segmentos de uma vez.
 
 As funções utilizam as entidades de `utils.drawable` e escrevem pixels no
-canvas por meio de `Drawing.paintPixel`.
+canvas em lote por meio de `Drawing.paintPixels` (uma chamada por primitiva).
+Os rasterizadores aceitam `canvas=` como alvo de escrita explícito; None usa
+o canvas global `Drawing.canvas`.
 """
 
+import functools
 import math
+import numpy as np
 from utils.drawable import Drawing, Point, Line, Circle, Polygon
 
 class Transformations:
-    """Transformações geométricas 2D sobre coordenadas inteiras."""
+    """Transformações geométricas 2D sem perdas (coordenadas em float).
+
+    Nenhuma transformação arredonda: sequências de operações não acumulam
+    erro e o arredondamento para pixels acontece apenas na rasterização.
+
+    Além das funções por ponto, oferece matrizes homogêneas 3x3 que podem ser
+    compostas e aplicadas a todos os vértices de um ou vários objetos em lote.
+    """
 
     def __init__(self):
         pass
@@ -25,23 +38,16 @@ class Transformations:
 
     @staticmethod
     def scale(x, y, scaleX, scaleY):
-        """Escala (x, y) por (scaleX, scaleY) com arredondamento estável.
-
-        Nota: somamos um pequeno epsilon para evitar o caso 0.5 ser truncado
-        para baixo por representação binária do float.
-        """
-        return round((x * scaleX)+ 0.000001), round((y * scaleY)+ 0.000001)
+        """Escala (x, y) por (scaleX, scaleY) em torno da origem."""
+        return x * scaleX, y * scaleY
 
     @staticmethod
     def rotate(x, y, theta):
-        """Rotaciona (x, y) por `theta` graus em torno da origem.
-
-        Retorna coordenadas inteiras (arredondadas com epsilon).
-        """
+        """Rotaciona (x, y) por `theta` graus em torno da origem."""
         angle = math.radians(theta)
         newX = x * math.cos(angle) - y * math.sin(angle)
         newY = x * math.sin(angle) + y * math.cos(angle)
-        return round(newX + 0.000001), round(newY + 0.000001)
+        return newX, newY
 
     @staticmethod
     def reflect(x, y, axis):
@@ -53,6 +59,108 @@ class Transformations:
         elif axis == 'yx':
             return y, x
 
+    # Matrizes homogêneas 3x3 (pontos como colunas [x, y, 1])
+
+    @staticmethod
+    def translationMatrix(deltaX, deltaY):
+        """Matriz de translação por (deltaX, deltaY)."""
+        return np.array([[1.0, 0.0, deltaX], [0.0, 1.0, deltaY], [0.0, 0.0, 1.0]])
+
+    @staticmethod
+    def scaleMatrix(scaleX, scaleY):
+        """Matriz de escala por (scaleX, scaleY) em torno da origem."""
+        return np.array([[scaleX, 0.0, 0.0], [0.0, scaleY, 0.0], [0.0, 0.0, 1.0]])
+
+    @staticmethod
+    def rotationMatrix(theta):
+        """Matriz de rotação por `theta` graus (cos/sin calculados uma única vez)."""
+        angle = math.radians(theta)
+        c, s = math.cos(angle), math.sin(angle)
+        return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+
+    @staticmethod
+    def reflectionMatrix(axis):
+        """Matriz de reflexão no eixo 'x', 'y' ou 'yx' (troca x<->y)."""
+        if axis == 'x':
+            return np.array([[1.0, 0.0, 0.0], [0.0, -1.0, 0.0], [0.0, 0.0, 1.0]])
+        elif axis == 'y':
+            return np.array([[-1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+        elif axis == 'yx':
+            return np.array([[0.0, 1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+
+    @staticmethod
+    def compose(*matrices):
+        """Compõe matrizes na ordem de aplicação (a primeira é aplicada primeiro)."""
+        result = np.identity(3)
+        for m in matrices:
+            result = m @ result
+        return result
+
+    @staticmethod
+    def aboutPivot(matrix, cx, cy):
+        """Reescreve `matrix` para agir em torno do ponto (cx, cy)."""
+        return Transformations.compose(Transformations.translationMatrix(-cx, -cy), matrix,
+                                       Transformations.translationMatrix(cx, cy))
+
+    @staticmethod
+    def applyMatrix(matrix, points, pivot=None):
+        """Aplica `matrix` a um array (N, 2) de pontos em uma operação NumPy.
+
+        Com `pivot=(cx, cy)` a matriz age nas coordenadas relativas ao pivô.
+        Devolve coordenadas float, sem arredondamento.
+        """
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        cx, cy = (0.0, 0.0) if pivot is None else pivot
+        x, y = pts[:, 0] - cx, pts[:, 1] - cy
+        return np.column_stack((matrix[0, 0]*x + matrix[0, 1]*y + matrix[0, 2] + cx,
+                                matrix[1, 0]*x + matrix[1, 1]*y + matrix[1, 2] + cy))
+
+    @staticmethod
+    def vertices(obj):
+        """Vértices transformáveis do objeto como array (N, 2).
+
+        Ponto: ele mesmo; reta: os dois extremos; círculo: o centro;
+        polígono: seu array de vértices.
+        """
+        if isinstance(obj, Point):
+            return np.array([[obj.x, obj.y]])
+        elif isinstance(obj, Line):
+            return np.array([[obj.pointA.x, obj.pointA.y], [obj.pointB.x, obj.pointB.y]])
+        elif isinstance(obj, Circle):
+            return np.array([[obj.center.x, obj.center.y]])
+        elif isinstance(obj, Polygon):
+            return obj.vertices
+        return np.zeros((0, 2))
+
+    @staticmethod
+    def setVertices(obj, points):
+        """Grava no objeto os vértices (N, 2) na ordem de `vertices(obj)`."""
+        if isinstance(obj, Point):
+            obj.x, obj.y = points[0].tolist()
+        elif isinstance(obj, Line):
+            obj.pointA.x, obj.pointA.y = points[0].tolist()
+            obj.pointB.x, obj.pointB.y = points[1].tolist()
+        elif isinstance(obj, Circle):
+            obj.center.x, obj.center.y = points[0].tolist()
+        elif isinstance(obj, Polygon):
+            obj.vertices[:] = points
+
+    @staticmethod
+    def transformObjects(objs, matrix, pivot=None):
+        """Aplica `matrix` aos vértices de todos os objetos de uma só vez.
+
+        Os vértices da seleção inteira são concatenados, transformados por
+        `applyMatrix` e devolvidos a cada objeto.
+        """
+        parts = [Transformations.vertices(o) for o in objs]
+        if not parts:
+            return
+        out = Transformations.applyMatrix(matrix, np.concatenate(parts), pivot)
+        start = 0
+        for o, part in zip(objs, parts):
+            Transformations.setVertices(o, out[start:start + len(part)])
+            start += len(part)
+
 
 ## Rasterização
 
@@ -63,27 +171,30 @@ class DDA:
         pass
     
     @staticmethod
-    def rasterizeLine(line=None, xA=None, yA=None, xB=None, yB=None):
+    def rasterizeLine(line=None, xA=None, yA=None, xB=None, yB=None, canvas=None):
         """Desenha uma linha DDA.
 
-        Pode receber um objeto `Line` ou coordenadas explícitas.
+        Pode receber um objeto `Line` ou coordenadas explícitas; os extremos
+        são arredondados para pixels antes da rasterização.
         """
         if line is not None: xA, yA, xB, yB = line.pointA.x, line.pointA.y, line.pointB.x, line.pointB.y
+        xA, yA, xB, yB = Drawing.snap(xA), Drawing.snap(yA), Drawing.snap(xB), Drawing.snap(yB)
         deltaX = xB - xA
         deltaY = yB - yA
         x = float(xA)
         y = float(yA)
-        Drawing.paintPixel(int(x), int(y), line.color)
+        xs, ys = [int(x)], [int(y)]
         steps = max(abs(deltaX), abs(deltaY))
-        if steps == 0:
-            return
-        xIncr = deltaX/steps
-        yIncr = deltaY/steps
+        if steps != 0:
+            xIncr = deltaX/steps
+            yIncr = deltaY/steps
 
-        for _ in range(int(steps)):
-            x += xIncr
-            y += yIncr
-            Drawing.paintPixel(int(x), int(y), line.color)
+            for _ in range(int(steps)):
+                x += xIncr
+                y += yIncr
+                xs.append(int(x))
+                ys.append(int(y))
+        Drawing.paintPixels(xs, ys, line.color, canvas)
 
 
 
@@ -95,15 +206,17 @@ class BresenhamLines:
         pass
 
     @staticmethod
-    def rasterizeLine(line=None, xA=None, yA=None, xB=None, yB=None):
+    def rasterizeLine(line=None, xA=None, yA=None, xB=None, yB=None, canvas=None):
         """Desenha uma linha usando Bresenham.
 
-        Pode receber um objeto `Line` ou coordenadas explícitas.
+        Pode receber um objeto `Line` ou coordenadas explícitas; os extremos
+        são arredondados para pixels antes da rasterização.
         """
         if line is not None: xA, yA, xB, yB = line.pointA.x, line.pointA.y, line.pointB.x, line.pointB.y
+        xA, yA, xB, yB = Drawing.snap(xA), Drawing.snap(yA), Drawing.snap(xB), Drawing.snap(yB)
         deltaX, deltaY = int(xB - xA), int(yB - yA)
         x, y = int(xA), int(yA)
-        Drawing.paintPixel(x, y, line.color)
+        xs, ys = [x], [y]
 
         if deltaX > 0: xIncr = 1
         else: xIncr, deltaX = -1, -deltaX
@@ -121,7 +234,8 @@ class BresenhamLines:
                 else: 
                     p += const2 
                     y += yIncr
-                Drawing.paintPixel(x, y, line.color)
+                xs.append(x)
+                ys.append(y)
         else:
             p = 2*deltaX - deltaY
             const1 = 2*deltaX
@@ -132,46 +246,496 @@ class BresenhamLines:
                 else: 
                     p += const2 
                     x += xIncr
-                Drawing.paintPixel(x, y, line.color)
+                xs.append(x)
+                ys.append(y)
+        Drawing.paintPixels(xs, ys, line.color, canvas)
 
 
 
 class BresenhamCircle:
-    """Rasterização de círculos pelo algoritmo de Bresenham (pontos simétricos)."""
+    """Rasterização de círculos pelo algoritmo de Bresenham (pontos simétricos).
+
+    A variável de decisão depende só do raio: a tabela de deslocamentos do
+    primeiro octante é calculada uma vez por raio (cache LRU limitado, só
+    para raios até `CACHE_MAX_RADIUS`), espelhada nos 8 octantes com operações
+    de array e transladada para o centro de cada círculo.
+    """
+
+    # nº máximo de raios distintos mantidos no cache de tabelas
+    CACHE_SIZE = 256
+    # maior raio com tabelas no cache (~100 KB por raio; o cache cheio fica
+    # abaixo de 30 MB): as maiores são refeitas pela forma fechada a cada uso
+    CACHE_MAX_RADIUS = 1024
+    # raio mínimo para gerar só os arcos visíveis (ver clippedOffsets): as
+    # buscas custam ~0,6 ms fixos, e refazer e filtrar a tabela (fora do
+    # cache) só fica mais caro que isso perto de r = 10k
+    ARC_MIN_RADIUS = 8192
+
+    # sinais (dx, dy) e troca a<->b de cada octante, na ordem de `offsets`
+    OCTANTS = ((1, 1, False), (1, -1, False), (-1, 1, False), (-1, -1, False),
+               (1, 1, True), (1, -1, True), (-1, 1, True), (-1, -1, True))
 
     def __init__(self):
         pass
 
     @staticmethod
-    def drawSimmetry(a, b, xc, yc, color):
+    def _simmetryPoints(a, b, xc, yc, xs, ys):
+        """Acrescenta a `xs`/`ys` os 8 pontos simétricos relativos a (xc, yc)."""
+        xs += (a+xc, a+xc, -a+xc, -a+xc, b+xc, b+xc, -b+xc, -b+xc)
+        ys += (b+yc, -b+yc, b+yc, -b+yc, a+yc, -a+yc, a+yc, -a+yc)
+
+    @staticmethod
+    def drawSimmetry(a, b, xc, yc, color, canvas=None):
         """Desenha os 8 pontos simétricos relativos ao centro (xc, yc)."""
-        Drawing.paintPixel(a+xc, b+yc, color)
-        Drawing.paintPixel(a+xc, -b+yc, color)
-        Drawing.paintPixel(-a+xc, b+yc, color)
-        Drawing.paintPixel(-a+xc, -b+yc, color)
-        Drawing.paintPixel(b+xc, a+yc, color)
-        Drawing.paintPixel(b+xc, -a+yc, color)
-        Drawing.paintPixel(-b+xc, a+yc, color)
-        Drawing.paintPixel(-b+xc, -a+yc, color)
-        
-    def rasterize(self, circle):
-        """Desenha um círculo dado `Circle(center, radius)` usando Bresenham."""
-        x = 0
-        y = circle.radius
-        p = 3 - 2*circle.radius
-        self.drawSimmetry(x, y, circle.center.x, circle.center.y, circle.color)
+        xs, ys = [], []
+        BresenhamCircle._simmetryPoints(a, b, xc, yc, xs, ys)
+        Drawing.paintPixels(xs, ys, color, canvas)
+
+    @staticmethod
+    def octant(radius):
+        """Tabela (a, b) do primeiro octante para um círculo de raio `radius`.
+
+        Retorna dois arrays somente-leitura com os pares visitados pelo laço
+        de decisão de Bresenham, na ordem em que são gerados. Acima de
+        `CACHE_MAX_RADIUS` a tabela vem da forma fechada (`column`), sem cache.
+        """
+        if radius <= BresenhamCircle.CACHE_MAX_RADIUS:
+            return BresenhamCircle._cachedOctant(radius)
+        a = np.arange(BresenhamCircle.octantSize(radius), dtype=np.int64)
+        b = BresenhamCircle.column(radius, a)
+        a.setflags(write=False)
+        b.setflags(write=False)
+        return a, b
+
+    @staticmethod
+    @functools.lru_cache(maxsize=CACHE_SIZE)
+    def _cachedOctant(radius):
+        """Tabela de `octant` gerada pelo laço de decisão (raios pequenos)."""
+        a, b = [0], [radius]
+        x, y = 0, radius
+        p = 3 - 2*radius
         while(x < y):
             if p < 0: p += 4*x + 6
             else :
                 p += 4*(x-y) + 10
                 y -= 1
             x += 1
-            self.drawSimmetry(x, y, circle.center.x, circle.center.y, circle.color)
+            a.append(x)
+            b.append(y)
+        a = np.array(a, dtype=np.int64)
+        b = np.array(b, dtype=np.int64)
+        a.setflags(write=False)
+        b.setflags(write=False)
+        return a, b
+
+    @staticmethod
+    def offsets(radius):
+        """Deslocamentos (dx, dy) de todos os pixels do círculo, nos 8 octantes.
+
+        Só raios até `CACHE_MAX_RADIUS` ficam no cache (ver `octant`).
+        """
+        if radius <= BresenhamCircle.CACHE_MAX_RADIUS:
+            return BresenhamCircle._cachedOffsets(radius)
+        return BresenhamCircle._mirror(radius)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=CACHE_SIZE)
+    def _cachedOffsets(radius):
+        return BresenhamCircle._mirror(radius)
+
+    @staticmethod
+    def _mirror(radius):
+        """Espelha a tabela de `octant` nos 8 octantes, na ordem de `OCTANTS`."""
+        a, b = BresenhamCircle.octant(radius)
+        dx = np.concatenate((a, a, -a, -a, b, b, -b, -b))
+        dy = np.concatenate((b, -b, b, -b, a, -a, a, -a))
+        dx.setflags(write=False)
+        dy.setflags(write=False)
+        return dx, dy
+
+    @staticmethod
+    def column(radius, a):
+        """Ordenada `b` do laço de Bresenham na coluna `a` do 1º octante (forma fechada).
+
+        A variável de decisão no passo (a, b) vale 2(a+1)² + b² + (b-1)² - 2r²,
+        logo `b` é o maior inteiro com b² + (b-1)² < 2(r² - a²), limitado a
+        cair no máximo 1 por coluna como no laço. `a` pode ser um array.
+        """
+        a = np.asarray(a, dtype=np.int64)
+        def fit(a):
+            v = np.maximum(4*(radius*radius - a*a) - 1, 0)
+            s = np.floor(np.sqrt(v.astype(np.float64))).astype(np.int64)
+            s -= s*s > v
+            s += (s+1)*(s+1) <= v
+            return (s + 1) // 2
+        return np.where(a > 0, np.maximum(fit(a), fit(a - 1) - 1), fit(a))
+
+    @staticmethod
+    def _firstColumn(radius, test, n):
+        """Menor `a` em [0, n] com `test(a)` verdadeiro (`test` monótono), ou n."""
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if test(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    @staticmethod
+    def _firstColumnsBelow(radius, limits, n):
+        """Para cada limite L, o menor `a` em [0, n] com `column(a) < L`, ou n.
+
+        Como `column` não cresce com `a`, cada resposta é uma busca binária;
+        todas andam juntas, com uma avaliação vetorizada de `column` por passo.
+        """
+        limits = np.asarray(limits, dtype=np.int64)
+        lo = np.zeros(len(limits), dtype=np.int64)
+        hi = np.full(len(limits), n, dtype=np.int64)
+        while (lo < hi).any():
+            mid = (lo + hi) // 2
+            below = BresenhamCircle.column(radius, mid) < limits
+            active = lo < hi
+            hi = np.where(active & below, mid, hi)
+            lo = np.where(active & ~below, mid + 1, lo)
+        return lo
+
+    @staticmethod
+    @functools.lru_cache(maxsize=CACHE_SIZE)
+    def octantSize(radius):
+        """Nº de pares (a, b) da tabela do 1º octante, sem gerá-la."""
+        col = BresenhamCircle.column
+        return BresenhamCircle._firstColumn(radius, lambda a: a >= int(col(radius, a)), radius + 1) + 1
+
+    @staticmethod
+    def _arcs(radius, window):
+        """Intervalos de colunas `a` visíveis em `window`, por octante.
+
+        Retorna `[(sx, sy, troca, lo, hi)]` na ordem de `OCTANTS`, só para os
+        octantes com algum pixel na janela (relativa ao centro). Requer raio > 0.
+        """
+        n = BresenhamCircle.octantSize(radius)
+        x1, y1, x2, y2 = window
+        ranges, limits = [], []
+        for sx, sy, swap in BresenhamCircle.OCTANTS:
+            # faixas permitidas para a coordenada que é ±a e para a que é ±b
+            (sa, alo, ahi), (sb, blo, bhi) = ((sy, y1, y2), (sx, x1, x2)) if swap else ((sx, x1, x2), (sy, y1, y2))
+            alo, ahi = (alo, ahi) if sa > 0 else (-ahi, -alo)
+            blo, bhi = (blo, bhi) if sb > 0 else (-bhi, -blo)
+            ranges.append((alo, ahi))
+            # b não cresce com a: {b <= bhi} e {b >= blo} são intervalos de a
+            limits += (bhi + 1, blo)
+        first = BresenhamCircle._firstColumnsBelow(radius, limits, n).tolist()
+        arcs = []
+        for k, (sx, sy, swap) in enumerate(BresenhamCircle.OCTANTS):
+            lo = max(0, ranges[k][0], first[2*k])
+            hi = min(n - 1, ranges[k][1], first[2*k + 1] - 1)
+            if lo <= hi:
+                arcs.append((sx, sy, swap, lo, hi))
+        return arcs
+
+    @staticmethod
+    def visibleOffsets(radius, window):
+        """Deslocamentos de `offsets(radius)` que caem em `window`, na mesma ordem.
+
+        `window` é um retângulo inclusivo `(x1, y1, x2, y2)` relativo ao centro.
+        Em cada octante os pixels visíveis formam um intervalo de colunas `a`
+        (o arco visível): os limites vêm de buscas binárias sobre a forma
+        fechada de `column` (ver `_arcs`), e só os pixels desse intervalo são
+        gerados, então o custo é proporcional ao arco visível e não à
+        circunferência.
+        """
+        if radius <= 0:
+            dx, dy = BresenhamCircle.offsets(radius)
+            keep = (dx >= window[0]) & (dx <= window[2]) & (dy >= window[1]) & (dy <= window[3])
+            return dx[keep], dy[keep]
+        parts = []
+        for sx, sy, swap, lo, hi in BresenhamCircle._arcs(radius, window):
+            a = np.arange(lo, hi + 1, dtype=np.int64)
+            b = BresenhamCircle.column(radius, a)
+            parts.append((sx*b, sy*a) if swap else (sx*a, sy*b))
+        if not parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    @staticmethod
+    def isVisible(radius, window):
+        """O círculo tem algum pixel em `window` (retângulo relativo ao centro)?
+
+        Teste exato sem gerar pixels: descarta janelas fora da bbox ou dentro
+        do disco de raio r-1 (todo pixel está a mais de r-1 do centro quando
+        r >= 2), aceita janelas que contêm um dos 4 pixels extremos (±r, 0),
+        (0, ±r) e só nos demais casos olha os pixels: na tabela em cache para
+        raios pequenos, nos arcos (`_arcs`) para os grandes.
+        """
+        x1, y1, x2, y2 = window
+        if x1 > radius or x2 < -radius or y1 > radius or y2 < -radius:
+            return False
+        if radius <= 1:
+            return len(BresenhamCircle.visibleOffsets(radius, window)[0]) > 0
+        if (x1 <= 0 <= x2 and (y1 <= radius <= y2 or y1 <= -radius <= y2)) or \
+                (y1 <= 0 <= y2 and (x1 <= radius <= x2 or x1 <= -radius <= x2)):
+            return True
+        far = max(x1*x1, x2*x2) + max(y1*y1, y2*y2)
+        if far <= (radius - 1) * (radius - 1):
+            return False
+        if radius < BresenhamCircle.ARC_MIN_RADIUS:
+            dx, dy = BresenhamCircle.offsets(radius)
+            return bool(((dx >= x1) & (dx <= x2) & (dy >= y1) & (dy <= y2)).any())
+        return bool(BresenhamCircle._arcs(radius, window))
+
+    @staticmethod
+    def clippedOffsets(radius, xc, yc, clip):
+        """Deslocamentos do círculo visíveis no retângulo `clip` (coords de buffer).
+
+        Círculos inteiros dentro do recorte (ou sem recorte) usam a tabela em
+        cache. Dos demais, só círculos grandes com pequena parte visível geram
+        os arcos (`visibleOffsets`); para os outros filtrar a tabela em cache
+        sai mais barato que as buscas.
+        """
+        if clip is None or (xc - radius >= clip[0] and xc + radius <= clip[2]
+                            and yc - radius >= clip[1] and yc + radius <= clip[3]):
+            return BresenhamCircle.offsets(radius)
+        window = (clip[0] - xc, clip[1] - yc, clip[2] - xc, clip[3] - yc)
+        # janela ∩ bbox do círculo; o arco dentro dela mede no máximo seu perímetro
+        w = min(window[2], radius) - max(window[0], -radius) + 1
+        h = min(window[3], radius) - max(window[1], -radius) + 1
+        if w <= 0 or h <= 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        if radius >= BresenhamCircle.ARC_MIN_RADIUS and w + h < radius:
+            return BresenhamCircle.visibleOffsets(radius, window)
+        dx, dy = BresenhamCircle.offsets(radius)
+        keep = (dx >= window[0]) & (dx <= window[2]) & (dy >= window[1]) & (dy <= window[3])
+        return dx[keep], dy[keep]
+
+    def rasterize(self, circle, clip=None, canvas=None):
+        """Desenha um círculo dado `Circle(center, radius)` usando Bresenham.
+
+        Todos os pontos do círculo são enviados ao canvas em um único lote;
+        apenas os arcos dentro de `clip` (por padrão, a área gravável do
+        canvas) são gerados.
+        """
+        xc, yc = Drawing.snap(circle.center.x), Drawing.snap(circle.center.y)
+        dx, dy = self.clippedOffsets(Drawing.snap(circle.radius), xc, yc,
+                                     Drawing.clipBounds(canvas) if clip is None else clip)
+        Drawing.paintPixels(dx + xc, dy + yc, circle.color, canvas)
+
+    @staticmethod
+    def rasterizeCircles(circles, canvas=None):
+        """Desenha vários círculos em lote, transladando as tabelas em cache.
+
+        Onde círculos se sobrepõem vale a cor do último, como no desenho um a um.
+        """
+        if not circles:
+            return
+        data = [(c.center.x, c.center.y, c.radius) for c in circles]
+        codes, palette = _palette([c.color for c in circles])
+        BresenhamCircle.paintCircles(data, codes, palette, canvas=canvas)
+
+    @staticmethod
+    def paintCircles(circles, codes, palette, clip=None, canvas=None):
+        """Desenha um array (N, 3) de círculos `(xc, yc, raio)` em lote.
+
+        `codes[i]` é o índice da cor do círculo i em `palette`. Centros e
+        raios são arredondados para pixels aqui. Só os pixels dentro de `clip`
+        (por padrão, a área gravável do canvas) são pintados: círculos grandes
+        geram só os arcos visíveis e os demais usam a tabela em cache, com o
+        lote inteiro filtrado de uma vez no fim.
+        """
+        if len(circles) == 0:
+            return
+        circles = Drawing.snapArray(circles).reshape(-1, 3)
+        if clip is None:
+            clip = Drawing.clipBounds(canvas)
+        small = BresenhamCircle.ARC_MIN_RADIUS
+        tables = [BresenhamCircle.offsets(r) if r < small else BresenhamCircle.clippedOffsets(r, xc, yc, clip)
+                  for xc, yc, r in circles.tolist()]
+        counts = np.array([len(t[0]) for t in tables])
+        ids = np.repeat(np.arange(len(circles)), counts)
+        xs = np.concatenate([t[0] for t in tables]) + circles[ids, 0]
+        ys = np.concatenate([t[1] for t in tables]) + circles[ids, 1]
+        if clip is not None:
+            keep = (xs >= clip[0]) & (xs <= clip[2]) & (ys >= clip[1]) & (ys <= clip[3])
+            if not keep.all():
+                xs, ys, ids = xs[keep], ys[keep], ids[keep]
+        _paintBatch(xs, ys, np.asarray(codes)[ids], palette, canvas)
 
 
         
 
 
+## Rasterização em lote (NumPy)
+
+def _palette(colors):
+    """Converte uma cor por primitiva em (códigos inteiros, paleta de cores)."""
+    index = {}
+    codes = np.array([index.setdefault(c, len(index)) for c in colors], dtype=np.intp)
+    return codes, list(index)
+
+
+def _paintBatch(xs, ys, codes, palette, canvas=None):
+    """Pinta pixels gerados por várias primitivas, uma chamada por cor.
+
+    `codes[i]` é o índice em `palette` da cor do pixel i. Onde primitivas se
+    sobrepõem vale a cor da última, como no desenho primitiva a primitiva.
+    Pixels fora da área gravável do canvas são descartados antes disso.
+    """
+    clip = Drawing.clipBounds(canvas)
+    if clip is not None and len(xs):
+        inside = (xs >= clip[0]) & (xs <= clip[2]) & (ys >= clip[1]) & (ys <= clip[3])
+        if not inside.all():
+            xs, ys, codes = xs[inside], ys[inside], codes[inside]
+    if len(xs) == 0:
+        return
+    first = codes[0]
+    if (codes == first).all():
+        Drawing.paintPixels(xs, ys, palette[first], canvas)
+        return
+    # mantém apenas a última ocorrência de cada pixel
+    x0, y0 = xs.min(), ys.min()
+    keys = (ys - y0) * (xs.max() - x0 + 1) + (xs - x0)
+    _, firstSeen = np.unique(keys[::-1], return_index=True)
+    last = len(keys) - 1 - firstSeen
+    xs, ys, codes = xs[last], ys[last], codes[last]
+    for code in np.unique(codes).tolist():
+        sel = codes == code
+        Drawing.paintPixels(xs[sel], ys[sel], palette[code], canvas)
+
+
+class LinesBatch:
+    """Rasterização vetorizada de N segmentos com NumPy.
+
+    Gera, segmento a segmento, exatamente os mesmos pixels de
+    `DDA.rasterizeLine` e `BresenhamLines.rasterizeLine`.
+    """
+
+    # limite de células (segmentos x passos) por bloco do DDA
+    CHUNK_CELLS = 1 << 20
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def rasterize(segments, algorithm='Bresenham', window=None):
+        """Rasteriza um array (N, 4) de segmentos `(xA, yA, xB, yB)`.
+
+        Os extremos são arredondados para pixels (`Drawing.snapArray`). Retorna
+        `(xs, ys, ids)`: as coordenadas de todos os pixels, agrupadas na ordem
+        dos segmentos, e o índice do segmento que gerou cada pixel.
+
+        Com `window` (x1, y1, x2, y2) o Bresenham pula os passos cujo eixo
+        maior cai fora da janela; os pixels restantes são os mesmos.
+        """
+        seg = Drawing.snapArray(segments).reshape(-1, 4)
+        if algorithm == 'DDA':
+            return LinesBatch._dda(seg)
+        return LinesBatch._bresenham(seg, window)
+
+    @staticmethod
+    def _bresenham(seg, window=None):
+        """Bresenham em forma fechada: o desvio no eixo menor após k passos é
+        `(2*menor*k + maior) // (2*maior)`, idêntico ao da variável de decisão.
+
+        Por ser fechada, a forma permite começar em qualquer passo: com `window`
+        só os passos k cujo eixo maior cai na janela são gerados."""
+        xA, yA, xB, yB = seg.T
+        deltaX, deltaY = xB - xA, yB - yA
+        xIncr = np.where(deltaX > 0, 1, -1)
+        yIncr = np.where(deltaY > 0, 1, -1)
+        deltaX, deltaY = np.abs(deltaX), np.abs(deltaY)
+        xMajor = deltaX > deltaY
+        major = np.where(xMajor, deltaX, deltaY)
+        minor = np.where(xMajor, deltaY, deltaX)
+        first = np.zeros_like(major)
+        last = major
+        if window is not None:
+            start = np.where(xMajor, xA, yA)
+            incr = np.where(xMajor, xIncr, yIncr)
+            lo = np.where(xMajor, window[0], window[1])
+            hi = np.where(xMajor, window[2], window[3])
+            # passos k em [0, maior] com lo <= início + incr*k <= hi
+            first = np.maximum(first, np.where(incr > 0, lo - start, start - hi))
+            last = np.minimum(last, np.where(incr > 0, hi - start, start - lo))
+        counts = np.maximum(last - first + 1, 0)
+        ids = np.repeat(np.arange(len(seg)), counts)
+        k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + first[ids]
+        offset = (2*minor[ids]*k + major[ids]) // np.maximum(2*major[ids], 1)
+        xm = xMajor[ids]
+        xs = xA[ids] + xIncr[ids] * np.where(xm, k, offset)
+        ys = yA[ids] + yIncr[ids] * np.where(xm, offset, k)
+        return xs, ys, ids
+
+    @staticmethod
+    def _dda(seg):
+        """DDA com a mesma acumulação sequencial em float do laço escalar.
+
+        Os segmentos são ordenados por número de passos e processados em blocos
+        preenchidos, acumulando os incrementos ao longo de cada linha da matriz.
+        """
+        xA, yA, xB, yB = seg.T
+        deltaX, deltaY = xB - xA, yB - yA
+        steps = np.maximum(np.abs(deltaX), np.abs(deltaY))
+        counts = steps + 1
+        nz = steps > 0
+        xIncr = np.divide(deltaX, steps, out=np.zeros(len(seg)), where=nz)
+        yIncr = np.divide(deltaY, steps, out=np.zeros(len(seg)), where=nz)
+        order = np.argsort(counts, kind='stable')
+        parts = []
+        start = 0
+        while start < len(order):
+            stop = start + 1
+            # amplia o bloco enquanto (linhas x maior comprimento) couber no limite
+            while stop < len(order) and (stop - start + 1) * counts[order[stop]] <= LinesBatch.CHUNK_CELLS:
+                stop += 1
+            rows = order[start:stop]
+            width = counts[rows[-1]]
+            valid = np.arange(width) < counts[rows][:, None]
+            accX = np.empty((len(rows), width))
+            accX[:, 0] = xA[rows]
+            accX[:, 1:] = xIncr[rows][:, None]
+            accY = np.empty((len(rows), width))
+            accY[:, 0] = yA[rows]
+            accY[:, 1:] = yIncr[rows][:, None]
+            np.cumsum(accX, axis=1, out=accX)
+            np.cumsum(accY, axis=1, out=accY)
+            parts.append((np.trunc(accX[valid]).astype(np.int64),
+                          np.trunc(accY[valid]).astype(np.int64),
+                          np.broadcast_to(rows[:, None], valid.shape)[valid]))
+            start = stop
+        if not parts:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty.astype(np.intp)
+        xs = np.concatenate([p[0] for p in parts])
+        ys = np.concatenate([p[1] for p in parts])
+        ids = np.concatenate([p[2] for p in parts])
+        # volta à ordem original dos segmentos (estável: preserva a ordem dos passos)
+        back = np.argsort(ids, kind='stable')
+        return xs[back], ys[back], ids[back]
+
+    @staticmethod
+    def rasterizeLines(lines, algorithm='Bresenham', canvas=None):
+        """Rasteriza uma sequência de `Line` em lote e pinta no canvas."""
+        if not lines:
+            return
+        seg = [(ln.pointA.x, ln.pointA.y, ln.pointB.x, ln.pointB.y) for ln in lines]
+        codes, palette = _palette([ln.color for ln in lines])
+        LinesBatch.paintSegments(seg, codes, palette, algorithm, canvas)
+
+    @staticmethod
+    def paintSegments(segments, codes, palette, algorithm='Bresenham', canvas=None):
+        """Rasteriza um array (N, 4) de segmentos e pinta no canvas.
+
+        `codes[i]` é o índice da cor do segmento i em `palette` (ex.: todas as
+        arestas de um polígono compartilham o mesmo código).
+        """
+        if len(segments) == 0:
+            return
+        xs, ys, ids = LinesBatch.rasterize(segments, algorithm, Drawing.clipBounds(canvas))
+        _paintBatch(xs, ys, np.asarray(codes)[ids], palette, canvas)
+
+
 ## Recorte
 
 class ClippingCS:
@@ -191,6 +755,11 @@ class ClippingCS:
         if y > self.yMax: code |= 8     # bit 3: acima
         return code
 
+    def _get_codes(self, x, y):
+        """Versão vetorizada de `_get_code` para arrays de coordenadas."""
+        return ((x < self.xMin) * 1 | (x > self.xMax) * 2
+                | (y < self.yMin) * 4 | (y > self.yMax) * 8)
+
     def clip_line(self, line: Line) -> Line | None:
         """Recorta um segmento `line` contra a janela retangular.
 
@@ -240,6 +809,50 @@ class ClippingCS:
             return Line(Point(pointA.x, pointA.y), Point(pointB.x, pointB.y), getattr(line, 'color', None))
         return None
 
+    def clip_lines(self, segments):
+        """Recorta em lote um array (N, 4) de segmentos `(xA, yA, xB, yB)`.
+
+        Retorna `(aceitos, extremos)`: máscara booleana (N,) e array float64
+        (N, 4) com os extremos resultantes (válidos só onde aceito), idênticos
+        aos de `clip_line`: extremos recortados são arredondados e os que já
+        estavam dentro da janela ficam intactos. Cada iteração trata de uma
+        vez todos os segmentos ainda indecisos.
+        """
+        seg = np.array(segments, dtype=np.float64).reshape(-1, 4)
+        accepted = np.zeros(len(seg), dtype=bool)
+        active = np.arange(len(seg))
+        while active.size:
+            s = seg[active]
+            codeA = self._get_codes(s[:, 0], s[:, 1])
+            codeB = self._get_codes(s[:, 2], s[:, 3])
+            inside = (codeA | codeB) == 0
+            accepted[active[inside]] = True
+            keep = ~inside & ((codeA & codeB) == 0)
+            active, s, codeA, codeB = active[keep], s[keep], codeA[keep], codeB[keep]
+            if not active.size:
+                break
+            # o extremo de fora é A quando A está fora, senão B (como em clip_line)
+            outA = codeA != 0
+            cOut = np.where(outA, codeA, codeB)
+            x = np.where(outA, s[:, 0], s[:, 2])
+            y = np.where(outA, s[:, 1], s[:, 3])
+            dx, dy = s[:, 2] - s[:, 0], s[:, 3] - s[:, 1]
+            xInt, yInt = np.empty_like(x), np.empty_like(y)
+            left = (cOut & 1) != 0
+            right = ~left & ((cOut & 2) != 0)
+            below = ~left & ~right & ((cOut & 4) != 0)
+            above = ~(left | right | below)
+            for sel, edge in ((left, self.xMin), (right, self.xMax)):
+                xInt[sel] = edge
+                yInt[sel] = y[sel] + dy[sel] * ((edge - x[sel]) / dx[sel])
+            for sel, edge in ((below, self.yMin), (above, self.yMax)):
+                yInt[sel] = edge
+                xInt[sel] = x[sel] + dx[sel] * ((edge - y[sel]) / dy[sel])
+            col = np.where(outA, 0, 2)
+            seg[active, col] = Drawing.snapArray(xInt)
+            seg[active, col + 1] = Drawing.snapArray(yInt)
+        return accepted, seg
+
 class ClippingLB:
     """Recorte de segmentos pelo algoritmo de Liang–Barsky."""
     def __init__(self, xMin, xMax, yMin, yMax):
@@ -268,6 +881,16 @@ class ClippingLB:
             result = False
         return result, uA, uB
 
+    @staticmethod
+    def _clipTests(p, q, uA, uB, ok):
+        """Versão vetorizada de `_clipTest`; `ok` marca quem ainda não foi rejeitado."""
+        neg, pos = p < 0, p > 0
+        r = np.divide(q, p, out=np.zeros_like(q), where=(neg | pos))
+        ok = ok & ~((neg & (r > uB)) | (pos & (r < uA)) | (~neg & ~pos & (q < 0)))
+        uA = np.where(ok & neg & (r > uA), r, uA)
+        uB = np.where(ok & pos & (r < uB), r, uB)
+        return ok, uA, uB
+
     def clip_line(self, line: Line) -> Line | None:
         """Recorta um segmento `line` e devolve nova `Line` ou `None`."""
         xA, yA = line.pointA.x, line.pointA.y
@@ -293,5 +916,86 @@ class ClippingLB:
                                     getattr(line, 'color', None))
         return None
 
+    def clip_lines(self, segments):
+        """Recorta em lote um array (N, 4) de segmentos `(xA, yA, xB, yB)`.
 
+        Retorna `(aceitos, extremos)`: máscara booleana (N,) e array float64
+        (N, 4) com os extremos arredondados (válidos só onde aceito),
+        idênticos aos de `clip_line`.
+        """
+        seg = np.array(segments, dtype=np.float64).reshape(-1, 4)
+        xA, yA, xB, yB = seg.T
+        deltaX, deltaY = xB - xA, yB - yA
+        uA, uB = np.zeros(len(seg)), np.ones(len(seg))
+        ok = np.ones(len(seg), dtype=bool)
+        for p, q in ((-deltaX, xA - self.xMin), (deltaX, self.xMax - xA),
+                     (-deltaY, yA - self.yMin), (deltaY, self.yMax - yA)):
+            ok, uA, uB = self._clipTests(p, q, uA, uB, ok)
+        # B usa o xA original, como em clip_line
+        cutB, cutA = uB < 1.0, uA > 0.0
+        out = np.column_stack((np.where(cutA, xA + deltaX * uA, xA),
+                               np.where(cutA, yA + deltaY * uA, yA),
+                               np.where(cutB, xA + deltaX * uB, xB),
+                               np.where(cutB, yA + deltaY * uB, yB)))
+        return ok, Drawing.snapArray(out).astype(np.float64)
+
+
+class ClippingSH:
+    """Recorte de polígonos pelo algoritmo de Sutherland–Hodgman.
+
+    O polígono é recortado sucessivamente contra as quatro bordas da janela e
+    o resultado é um polígono fechado. Antes do trabalho por aresta, a bbox do
+    polígono decide em O(1) os casos triviais (todo dentro ou todo fora).
+    """
+    def __init__(self, xMin, xMax, yMin, yMax):
+        self.xMin = xMin
+        self.xMax = xMax
+        self.yMin = yMin
+        self.yMax = yMax
+
+    @staticmethod
+    def _clipEdge(pts, axis, bound, sign):
+        """Recorta a cadeia fechada `pts` contra o semiplano sign*(p[axis]-bound) >= 0."""
+        other = 1 - axis
+        out = []
+        prev = pts[-1]
+        prevIn = sign * (prev[axis] - bound) >= 0
+        for cur in pts:
+            curIn = sign * (cur[axis] - bound) >= 0
+            if curIn != prevIn:
+                t = (bound - prev[axis]) / (cur[axis] - prev[axis])
+                cross = [0.0, 0.0]
+                cross[axis] = bound
+                cross[other] = prev[other] + (cur[other] - prev[other]) * t
+                out.append(cross)
+            if curIn:
+                out.append(cur)
+            prev, prevIn = cur, curIn
+        return out
+
+    def clip_polygon(self, polygon: Polygon) -> Polygon | None:
+        """Recorta `polygon` e devolve um novo `Polygon` fechado ou `None`.
+
+        Conjuntos de arestas soltas (`closed=False`) não formam um anel e são
+        recortados aresta a aresta com Liang–Barsky.
+        """
+        v = polygon.vertices
+        if len(v) == 0:
+            return None
+        (x1, y1), (x2, y2) = v.min(axis=0), v.max(axis=0)
+        if x2 < self.xMin or x1 > self.xMax or y2 < self.yMin or y1 > self.yMax:
+            return None
+        if self.xMin <= x1 and x2 <= self.xMax and self.yMin <= y1 and y2 <= self.yMax:
+            return Polygon(color=polygon.color, vertices=v.copy(), closed=polygon.closed)
+        if not polygon.closed:
+            accepted, seg = ClippingLB(self.xMin, self.xMax, self.yMin, self.yMax).clip_lines(polygon.segments())
+            if not accepted.any():
+                return None
+            return Polygon(color=polygon.color, vertices=seg[accepted].reshape(-1, 2), closed=False)
+        pts = v.tolist()
+        for axis, bound, sign in ((0, self.xMin, 1), (0, self.xMax, -1), (1, self.yMin, 1), (1, self.yMax, -1)):
+            pts = self._clipEdge(pts, axis, bound, sign)
+            if not pts:
+                return None
+        return Polygon(color=polygon.color, vertices=pts, closed=True)
 
@@ -2,93 +2,278 @@
 
 Define classes de apoio para desenho em um canvas abstrato, incluindo:
 - Drawing: base com acesso estático ao canvas e utilitário para pintar pixels;
-- Point, Line, Circle e Polygon: primitivas geométricas com metadados de cor.
+- Point, Line, Circle e Polygon: primitivas geométricas com metadados de cor
+  (o Polygon guarda seus vértices em um array NumPy compacto).
 
 As classes não implementam lógica de rasterização; isso é responsabilidade
 dos algoritmos em `utils.algorithms`. Aqui apenas guardamos dados e fornecemos
-um ponto único (Drawing.canvas) por onde os algoritmos escrevem pixels.
+um ponto único (Drawing.canvas) por onde os algoritmos escrevem pixels, seja
+um pixel por vez (`paintPixel`) ou em lote (`paintPixels`). Esse canvas global
+é apenas o padrão: quem passa `canvas=` explicitamente escreve em outro alvo,
+o que permite vários renders simultâneos no mesmo processo.
+
+As coordenadas do modelo podem ser float (resultado de transformações sem
+perdas); elas só são arredondadas para pixels na rasterização (`Drawing.snap`).
 """
 
+import sys
+import numpy as np
+
+
+def _fmt(v):
+    """Formata uma coordenada para exibição (inteiros sem casas decimais)."""
+    v = float(v)
+    return int(v) if v.is_integer() else round(v, 2)
+
 
 class Drawing:
     """Classe base para objetos desenháveis.
 
     Mantém uma referência estática a um canvas que recebe pixels via
-    `set_pixel(x, y, color)`.
+    `set_pixel(x, y, color)` e, opcionalmente, em lote via
+    `set_pixels(xs, ys, color)`. Os métodos de pintura aceitam `canvas=` para
+    escrever em outro alvo; None usa o canvas global.
+
+    Cada objeto guarda sua bounding box em cache (`bounds()`); quem altera a
+    geometria deve chamar `invalidate()` em seguida.
+
+    As primitivas usam `__slots__` (sem `__dict__` por instância), o que reduz
+    memória em cenas grandes e acelera o acesso a atributos nos rasterizadores.
     """
 
+    __slots__ = ('_bounds',)
+
     canvas = None
 
     def __init__(self):
-        pass
+        self._bounds = None
 
     @staticmethod
     def set_canvas(canvas):
         """Registra o objeto de canvas que receberá os pixels.
 
-        O canvas deve expor um método `set_pixel(x: int, y: int, color: str)`.
+        O canvas deve expor um método `set_pixel(x, y, color: str)`, que converte
+        as coordenadas para inteiros.
         """
         Drawing.canvas = canvas
 
     @staticmethod
-    def paintPixel(x, y, color):
+    def target(canvas=None):
+        """Alvo de escrita: `canvas`, se dado, ou o canvas global."""
+        return Drawing.canvas if canvas is None else canvas
+
+    @staticmethod
+    def paintPixel(x, y, color, canvas=None):
         """Pinta um único pixel (x, y) no canvas, se houver um canvas ativo.
 
         Parâmetros
         - x, y: coordenadas inteiras no buffer lógico do canvas
         - color: cor no formato aceito pelo canvas (ex.: "#RRGGBB")
+        - canvas: alvo de escrita (None = `Drawing.canvas`)
+        """
+        canvas = Drawing.target(canvas)
+        if canvas is not None:
+            canvas.set_pixel(x, y, color)
+
+    @staticmethod
+    def internColor(color):
+        """Interna strings de cor: objetos com a mesma cor compartilham a string.
+
+        Assim comparações e buscas em caches de cor (paletas, cor -> ARGB do
+        canvas) resolvem por identidade, sem comparar caracteres.
         """
-        if Drawing.canvas:
-            Drawing.canvas.set_pixel(int(x), int(y), color)
+        return sys.intern(color) if type(color) is str else color
+
+    @staticmethod
+    def snap(v):
+        """Arredonda uma coordenada do modelo para o pixel mais próximo.
+
+        Usa o mesmo epsilon das transformações para que x.5 vá sempre para cima.
+        """
+        return round(v + 0.000001)
+
+    @staticmethod
+    def snapArray(a):
+        """Versão vetorizada de `snap` (devolve um array int64)."""
+        return np.round(np.asarray(a, dtype=np.float64) + 0.000001).astype(np.int64)
+
+    def bounds(self):
+        """Bounding box inteira inclusiva `(x1, y1, x2, y2)`, ou None se vazia.
+
+        Calculada sobre as coordenadas já arredondadas para pixels.
+
+        O valor é calculado uma vez e reaproveitado até `invalidate()`.
+        """
+        if self._bounds is None:
+            self._bounds = self._compute_bounds()
+        return self._bounds
+
+    def invalidate(self):
+        """Descarta a bounding box em cache após uma mudança de geometria."""
+        self._bounds = None
+
+    def _compute_bounds(self):
+        return None
+
+    @staticmethod
+    def clipBounds(canvas=None):
+        """Área gravável do canvas `(x1, y1, x2, y2)` (inclusiva), ou None.
+
+        Usa `canvas.writable_bounds()` quando existir; os rasterizadores a
+        usam para gerar apenas os pixels que de fato serão escritos.
+        """
+        bounds = getattr(Drawing.target(canvas), 'writable_bounds', None)
+        return bounds() if bounds is not None else None
+
+    @staticmethod
+    def paintPixels(xs, ys, color, canvas=None):
+        """Pinta um lote de pixels de mesma cor com uma única chamada ao canvas.
+
+        Parâmetros
+        - xs, ys: sequências paralelas de coordenadas inteiras do buffer lógico
+        - color: cor única aplicada a todo o lote
+        - canvas: alvo de escrita (None = `Drawing.canvas`)
+
+        Se o canvas não expuser `set_pixels`, recai em `set_pixel` por pixel.
+        """
+        canvas = Drawing.target(canvas)
+        if canvas is None:
+            return
+        set_pixels = getattr(canvas, 'set_pixels', None)
+        if set_pixels is not None:
+            set_pixels(xs, ys, color)
+        else:
+            for x, y in zip(xs, ys):
+                canvas.set_pixel(x, y, color)
 
 
 class Point(Drawing):
     """Ponto (x, y) com cor opcional."""
 
+    __slots__ = ('x', 'y', 'color')
+
     def __init__(self, x=None, y=None, color=None):
+        super().__init__()
         self.x = x
         self.y = y
-        self.color = color
+        self.color = Drawing.internColor(color)
+
+    def _compute_bounds(self):
+        x, y = Drawing.snap(self.x), Drawing.snap(self.y)
+        return x, y, x, y
 
     def __str__(self):
-        return f'Ponto Coordenadas:\nX: {self.x}\tY: {self.y}'
+        return f'Ponto Coordenadas:\nX: {_fmt(self.x)}\tY: {_fmt(self.y)}'
 
 
 class Line(Drawing):
     """Segmento de reta entre dois pontos, com cor opcional."""
 
+    __slots__ = ('pointA', 'pointB', 'color')
+
     def __init__(self, pointA, pointB, color=None):
+        super().__init__()
         self.pointA = pointA
         self.pointB = pointB
-        self.color = color
+        self.color = Drawing.internColor(color)
+
+    def _compute_bounds(self):
+        snap = Drawing.snap
+        xA, yA, xB, yB = snap(self.pointA.x), snap(self.pointA.y), snap(self.pointB.x), snap(self.pointB.y)
+        return min(xA, xB), min(yA, yB), max(xA, xB), max(yA, yB)
 
     def __str__(self):
         return (
-            f'Linha Coordenadas:\nX1: {self.pointA.x} \tY1: {self.pointA.y}\n'
-            f'X2: {self.pointB.x} \tY2: {self.pointB.y}'
+            f'Linha Coordenadas:\nX1: {_fmt(self.pointA.x)} \tY1: {_fmt(self.pointA.y)}\n'
+            f'X2: {_fmt(self.pointB.x)} \tY2: {_fmt(self.pointB.y)}'
         )
 
 
 class Circle(Drawing):
     """Círculo definido por centro, raio e cor opcional."""
 
+    __slots__ = ('center', 'radius', 'color')
+
     def __init__(self, center, radius, color=None):
+        super().__init__()
         self.center = center
         self.radius = radius
-        self.color = color
+        self.color = Drawing.internColor(color)
+
+    def _compute_bounds(self):
+        snap = Drawing.snap
+        x, y, r = snap(self.center.x), snap(self.center.y), abs(snap(self.radius))
+        return x - r, y - r, x + r, y + r
 
     def __str__(self):
         return (
-            f'Circulo Coordenadas:\nX: {self.center.x} \tY: {self.center.y} '
-            f'\tRaio: {self.radius}'
+            f'Circulo Coordenadas:\nX: {_fmt(self.center.x)} \tY: {_fmt(self.center.y)} '
+            f'\tRaio: {_fmt(self.radius)}'
         )
 
 
 class Polygon(Drawing):
-    """Polígono definido por uma lista de segmentos de reta (linhas)."""
+    """Polígono compacto com vértices compartilhados.
+
+    Os vértices ficam em um único array NumPy contíguo `vertices` de forma
+    (n, 2). Com `closed=True` as arestas são implícitas (i -> i+1, e a última
+    fecha no primeiro vértice); com `closed=False` os vértices formam pares
+    independentes (2i, 2i+1), usado para conjuntos de arestas soltas.
+
+    A propriedade `lines` continua disponível por compatibilidade, mas gera
+    cópias: alterações na geometria devem ser feitas em `vertices`.
+    """
+
+    __slots__ = ('vertices', 'closed', 'color')
+
+    def __init__(self, lines=None, color=None, vertices=None, closed=True):
+        super().__init__()
+        lines = list(lines or [])
+        if vertices is None:
+            if lines and Polygon._isClosedChain(lines):
+                vertices = [(ln.pointA.x, ln.pointA.y) for ln in lines]
+            else:
+                closed = False
+                vertices = [(p.x, p.y) for ln in lines for p in (ln.pointA, ln.pointB)]
+        if color is None and lines:
+            color = lines[0].color
+        self.vertices = np.array(vertices, dtype=np.float64).reshape(-1, 2)
+        self.closed = closed
+        self.color = Drawing.internColor(color)
+
+    @classmethod
+    def fromVertices(cls, vertices, color=None):
+        """Cria um polígono fechado a partir de uma sequência de (x, y)."""
+        return cls(color=color, vertices=vertices, closed=True)
+
+    @staticmethod
+    def _isClosedChain(lines):
+        """Verifica se cada aresta começa onde a anterior termina, fechando o anel."""
+        for i, ln in enumerate(lines):
+            nxt = lines[(i+1) % len(lines)]
+            if (ln.pointB.x, ln.pointB.y) != (nxt.pointA.x, nxt.pointA.y):
+                return False
+        return True
+
+    def segments(self):
+        """Arestas como array (m, 4) de `(xA, yA, xB, yB)` em coords do modelo."""
+        v = self.vertices
+        if self.closed:
+            return np.hstack((v, np.roll(v, -1, axis=0)))
+        return v.reshape(-1, 4)
+
+    @property
+    def lines(self):
+        """Arestas como objetos `Line` (cópias, apenas para leitura)."""
+        return [Line(Point(xA, yA), Point(xB, yB), self.color)
+                for xA, yA, xB, yB in self.segments().tolist()]
 
-    def __init__(self, lines):
-        self.lines = lines
+    def _compute_bounds(self):
+        if len(self.vertices) == 0:
+            return None
+        x1, y1 = Drawing.snapArray(self.vertices.min(axis=0)).tolist()
+        x2, y2 = Drawing.snapArray(self.vertices.max(axis=0)).tolist()
+        return x1, y1, x2, y2
 
     def __str__(self):
         ret = "Poligono Coordenadas:\n"
@@ -99,4 +284,3 @@ class Polygon(Drawing):
             ret += "\n"
             idx += 1
         return ret
-    
\ No newline at end of file
@@ -0,0 +1,250 @@
+"""Framebuffers em memória para o canvas.
+
+Define o `ArrayFramebuffer`, um buffer de pixels ARGB32 guardado em uma matriz
+NumPy `uint32` de forma (altura, largura). O módulo não depende do PyQt: o
+canvas da interface apenas embrulha a mesma memória em uma `QImage`, sem cópia,
+de modo que limpezas, recortes e escritas em lote viram operações de array.
+
+Para canvas lógicos grandes há o `TiledFramebuffer`, com a mesma interface,
+que divide o buffer em blocos quadrados alocados só quando recebem pixels.
+
+Retângulos são tuplas inclusivas `(x1, y1, x2, y2)` em coords de buffer.
+"""
+
+import numpy as np
+
+
+class ArrayFramebuffer:
+    """Buffer de pixels ARGB32 (`uint32`) endereçado como `pixels[y, x]`."""
+
+    def __init__(self, width, height, fill=0xFFFFFFFF):
+        self.width = max(1, int(width))
+        self.height = max(1, int(height))
+        self.pixels = np.full((self.height, self.width), fill, dtype=np.uint32)
+
+    @property
+    def stride(self):
+        """Bytes por linha da matriz (necessário para embrulhar em QImage)."""
+        return self.pixels.strides[0]
+
+    def bounds(self, clip=None):
+        """Retângulo gravável: o buffer inteiro ou sua interseção com `clip`.
+
+        Retorna None quando a interseção é vazia.
+        """
+        x1, y1, x2, y2 = 0, 0, self.width - 1, self.height - 1
+        if clip is not None:
+            x1, y1 = max(x1, clip[0]), max(y1, clip[1])
+            x2, y2 = min(x2, clip[2]), min(y2, clip[3])
+        if x1 > x2 or y1 > y2:
+            return None
+        return x1, y1, x2, y2
+
+    def fill(self, argb, rect=None):
+        """Preenche o buffer (ou apenas `rect`) com a cor ARGB dada."""
+        r = self.bounds(rect)
+        if r is None:
+            return
+        x1, y1, x2, y2 = r
+        self.pixels[y1:y2+1, x1:x2+1] = argb
+
+    def set_pixel(self, x, y, argb, clip=None):
+        """Escreve um único pixel se estiver dentro do buffer e do recorte."""
+        r = self.bounds(clip)
+        if r is None or not (r[0] <= x <= r[2] and r[1] <= y <= r[3]):
+            return False
+        self.pixels[y, x] = argb
+        return True
+
+    def write(self, xs, ys, argb, clip=None):
+        """Escreve um lote de pixels de mesma cor, recortado de uma só vez.
+
+        Retorna o retângulo `(x1, y1, x2, y2)` que envolve os pixels escritos,
+        ou None se nenhum foi escrito.
+        """
+        r = self.bounds(clip)
+        if r is None:
+            return None
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+        x1, y1, x2, y2 = r
+        inside = (xs >= x1) & (xs <= x2) & (ys >= y1) & (ys <= y2)
+        if not inside.all():
+            xs, ys = xs[inside], ys[inside]
+        if xs.size == 0:
+            return None
+        self.pixels[ys, xs] = argb
+        return int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max())
+
+    def to_array(self, rect=None):
+        """Cópia densa (altura, largura) do buffer, ou só de `rect`."""
+        r = self.bounds(rect)
+        if r is None:
+            return np.empty((0, 0), dtype=np.uint32)
+        x1, y1, x2, y2 = r
+        return self.pixels[y1:y2+1, x1:x2+1].copy()
+
+    def paste(self, rect, pixels):
+        """Copia a matriz `pixels` para o retângulo `rect` (de mesmo tamanho)."""
+        x1, y1, x2, y2 = rect
+        self.pixels[y1:y2+1, x1:x2+1] = pixels
+
+    def snapshot(self):
+        """Cópia dos pixels atuais (camada salva para um `blit` posterior)."""
+        return self.pixels.copy()
+
+    def blit(self, pixels):
+        """Copia uma camada de mesmo tamanho para o buffer, na mesma memória."""
+        np.copyto(self.pixels, pixels)
+
+
+class TiledFramebuffer:
+    """Buffer ARGB32 em blocos `TILE x TILE` alocados sob demanda.
+
+    Blocos nunca pintados não existem: valem a cor de fundo `background`.
+    A memória cresce com o conteúdo desenhado e não com a área do canvas;
+    limpar o buffer inteiro só descarta os blocos, e limpar um retângulo só
+    toca nos blocos já alocados que ele cobre.
+    """
+
+    TILE = 256
+
+    def __init__(self, width, height, fill=0xFFFFFFFF):
+        self.width = max(1, int(width))
+        self.height = max(1, int(height))
+        self.background = fill
+        self.tiles_x = -(-self.width // self.TILE)
+        self.tiles_y = -(-self.height // self.TILE)
+        self.tiles = {}     # (tx, ty) -> matriz uint32 (TILE, TILE)
+
+    def bounds(self, clip=None):
+        """Retângulo gravável: o buffer inteiro ou sua interseção com `clip`.
+
+        Retorna None quando a interseção é vazia.
+        """
+        x1, y1, x2, y2 = 0, 0, self.width - 1, self.height - 1
+        if clip is not None:
+            x1, y1 = max(x1, clip[0]), max(y1, clip[1])
+            x2, y2 = min(x2, clip[2]), min(y2, clip[3])
+        if x1 > x2 or y1 > y2:
+            return None
+        return x1, y1, x2, y2
+
+    def tile_rect(self, tx, ty):
+        """Parte do bloco (tx, ty) dentro do buffer, como retângulo inclusivo."""
+        t = self.TILE
+        return tx*t, ty*t, min(self.width, (tx+1)*t) - 1, min(self.height, (ty+1)*t) - 1
+
+    def tiles_in(self, rect):
+        """Blocos (tx, ty) que intersectam `rect` (coords de buffer)."""
+        r = self.bounds(rect)
+        if r is None:
+            return []
+        t = self.TILE
+        return [(tx, ty) for ty in range(r[1] // t, r[3] // t + 1) for tx in range(r[0] // t, r[2] // t + 1)]
+
+    def _tile(self, tx, ty):
+        """Bloco (tx, ty), alocado com a cor de fundo se ainda não existir."""
+        tile = self.tiles.get((tx, ty))
+        if tile is None:
+            tile = self.tiles[(tx, ty)] = np.full((self.TILE, self.TILE), self.background, dtype=np.uint32)
+        return tile
+
+    def fill(self, argb, rect=None):
+        """Preenche o buffer (ou apenas `rect`) com a cor ARGB dada."""
+        r = self.bounds(rect)
+        if r is None:
+            return
+        x1, y1, x2, y2 = r
+        if r == (0, 0, self.width - 1, self.height - 1):
+            self.background = argb
+            self.tiles.clear()
+            return
+        for tx, ty in self.tiles_in(r):
+            bx1, by1, bx2, by2 = self.tile_rect(tx, ty)
+            if x1 <= bx1 and y1 <= by1 and bx2 <= x2 and by2 <= y2 and argb == self.background:
+                # bloco inteiro volta ao fundo: basta descartá-lo
+                self.tiles.pop((tx, ty), None)
+                continue
+            if (tx, ty) not in self.tiles and argb == self.background:
+                continue
+            tile = self._tile(tx, ty)
+            tile[max(y1, by1) - by1:min(y2, by2) - by1 + 1, max(x1, bx1) - bx1:min(x2, bx2) - bx1 + 1] = argb
+
+    def set_pixel(self, x, y, argb, clip=None):
+        """Escreve um único pixel se estiver dentro do buffer e do recorte."""
+        r = self.bounds(clip)
+        if r is None or not (r[0] <= x <= r[2] and r[1] <= y <= r[3]):
+            return False
+        t = self.TILE
+        if (x // t, y // t) in self.tiles or argb != self.background:
+            self._tile(x // t, y // t)[y % t, x % t] = argb
+        return True
+
+    def write(self, xs, ys, argb, clip=None):
+        """Escreve um lote de pixels de mesma cor, agrupados por bloco.
+
+        Retorna o retângulo `(x1, y1, x2, y2)` que envolve os pixels escritos,
+        ou None se nenhum foi escrito.
+        """
+        r = self.bounds(clip)
+        if r is None:
+            return None
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+        x1, y1, x2, y2 = r
+        inside = (xs >= x1) & (xs <= x2) & (ys >= y1) & (ys <= y2)
+        if not inside.all():
+            xs, ys = xs[inside], ys[inside]
+        if xs.size == 0:
+            return None
+        t = self.TILE
+        keys = (ys // t) * self.tiles_x + (xs // t)
+        order = np.argsort(keys, kind='stable')
+        cuts = np.flatnonzero(np.diff(keys[order])) + 1
+        for run in np.split(order, cuts):
+            ty, tx = divmod(int(keys[run[0]]), self.tiles_x)
+            if (tx, ty) not in self.tiles and argb == self.background:
+                continue
+            self._tile(tx, ty)[ys[run] % t, xs[run] % t] = argb
+        return int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max())
+
+    def to_array(self, rect=None):
+        """Cópia densa (altura, largura) do buffer, ou só de `rect`."""
+        r = self.bounds(rect)
+        if r is None:
+            return np.empty((0, 0), dtype=np.uint32)
+        x1, y1, x2, y2 = r
+        out = np.full((y2 - y1 + 1, x2 - x1 + 1), self.background, dtype=np.uint32)
+        for (tx, ty), tile in self.tiles.items():
+            bx1, by1, bx2, by2 = self.tile_rect(tx, ty)
+            ix1, iy1, ix2, iy2 = max(x1, bx1), max(y1, by1), min(x2, bx2), min(y2, by2)
+            if ix1 > ix2 or iy1 > iy2:
+                continue
+            out[iy1-y1:iy2-y1+1, ix1-x1:ix2-x1+1] = tile[iy1-by1:iy2-by1+1, ix1-bx1:ix2-bx1+1]
+        return out
+
+    def paste(self, rect, pixels):
+        """Copia a matriz `pixels` para o retângulo `rect` (de mesmo tamanho).
+
+        Blocos ainda não alocados só são criados se a região trouxer algum
+        pixel diferente do fundo.
+        """
+        x1, y1, x2, y2 = rect
+        for tx, ty in self.tiles_in(rect):
+            bx1, by1, bx2, by2 = self.tile_rect(tx, ty)
+            ix1, iy1, ix2, iy2 = max(x1, bx1), max(y1, by1), min(x2, bx2), min(y2, by2)
+            part = pixels[iy1-y1:iy2-y1+1, ix1-x1:ix2-x1+1]
+            if (tx, ty) not in self.tiles and (part == self.background).all():
+                continue
+            self._tile(tx, ty)[iy1-by1:iy2-by1+1, ix1-bx1:ix2-bx1+1] = part
+
+    def snapshot(self):
+        """Cópia dos blocos atuais (camada salva para um `blit` posterior)."""
+        return self.background, {k: tile.copy() for k, tile in self.tiles.items()}
+
+    def blit(self, snapshot):
+        """Restaura uma camada salva por `snapshot`."""
+        self.background, tiles = snapshot
+        self.tiles = {k: tile.copy() for k, tile in tiles.items()}
+
@@ -0,0 +1,266 @@
+"""Renderização sem interface gráfica (headless).
+
+Permite rasterizar cenas fora da aplicação Qt, por exemplo em servidores de
+build ou em processos de trabalho: o módulo não importa o PyQt6. Define:
+- `color_argb`: conversão de cores ("#RRGGBB", "#AARRGGBB", nomes básicos)
+  para o inteiro ARGB32 usado pelos framebuffers;
+- `ArrayCanvas`: canvas que implementa o protocolo de `Drawing.canvas`
+  (`set_pixel`, `set_pixels`, `writable_bounds`) sobre um `ArrayFramebuffer`;
+- `draw_batches`: rasteriza lotes `(tipo, dados, códigos, paleta)`;
+- `draw_batches_tiled`: o mesmo, dividindo o buffer em blocos rasterizados em
+  paralelo por um executor (`concurrent.futures`) e compostos no framebuffer;
+- `chunked`: divide lotes em pedaços menores, para rasterizações que podem ser
+  interrompidas entre um pedaço e outro;
+- `render(scene, width, height, algorithm)`: ponto de entrada que desenha uma
+  cena (lista de objetos ou `SceneStore`) e devolve o framebuffer resultante.
+
+Retângulos são tuplas inclusivas `(x1, y1, x2, y2)` em coords de buffer.
+"""
+
+import functools
+
+import numpy as np
+
+from utils.drawable import Drawing
+from utils.algorithms import BresenhamCircle, LinesBatch
+from utils.framebuffer import ArrayFramebuffer
+from utils.scene import SceneStore, scene_batches
+
+# nomes de cor aceitos além da notação hexadecimal (cores básicas do SVG/CSS)
+COLOR_NAMES = {
+    'black': 0x000000, 'white': 0xFFFFFF, 'red': 0xFF0000, 'lime': 0x00FF00,
+    'green': 0x008000, 'blue': 0x0000FF, 'yellow': 0xFFFF00, 'cyan': 0x00FFFF,
+    'magenta': 0xFF00FF, 'gray': 0x808080, 'grey': 0x808080, 'silver': 0xC0C0C0,
+    'maroon': 0x800000, 'olive': 0x808000, 'navy': 0x000080, 'purple': 0x800080,
+    'teal': 0x008080, 'orange': 0xFFA500,
+}
+
+
+@functools.lru_cache(maxsize=256)
+def color_argb(color):
+    """Cor como inteiro ARGB32 empacotado, com cache LRU.
+
+    Aceita "#RGB", "#RRGGBB", "#AARRGGBB" (mesma ordem do QColor), um nome de
+    `COLOR_NAMES` ou um inteiro já empacotado; cores sem canal alfa são opacas.
+    """
+    if isinstance(color, int):
+        return color & 0xFFFFFFFF
+    name = str(color).strip().lower()
+    if name in COLOR_NAMES:
+        return 0xFF000000 | COLOR_NAMES[name]
+    digits = name[1:] if name.startswith('#') else None
+    if digits is not None and all(c in '0123456789abcdef' for c in digits):
+        if len(digits) == 3:
+            return 0xFF000000 | int(''.join(c * 2 for c in digits), 16)
+        if len(digits) == 6:
+            return 0xFF000000 | int(digits, 16)
+        if len(digits) == 8:
+            return int(digits, 16)
+    raise ValueError(f'cor inválida: {color!r}')
+
+
+class ArrayCanvas:
+    """Canvas em memória com a mesma interface de escrita do `CanvasWidget`.
+
+    `origin` posiciona o buffer dentro de um canvas maior: o pixel (0, 0) do
+    buffer corresponde a `origin` e as coordenadas recebidas (e o recorte)
+    continuam absolutas. É assim que cada bloco de `draw_batches_tiled` é
+    rasterizado.
+
+    Com `framebuffer` o canvas escreve em um buffer existente (um
+    `ArrayFramebuffer` ou `TiledFramebuffer`) em vez de criar um novo.
+    """
+
+    def __init__(self, width, height, background='white', origin=(0, 0), framebuffer=None):
+        if framebuffer is None:
+            framebuffer = ArrayFramebuffer(width, height, color_argb(background))
+        self.framebuffer = framebuffer
+        self.width = self.framebuffer.width
+        self.height = self.framebuffer.height
+        self.origin = (int(origin[0]), int(origin[1]))
+        self.clip = None    # recorte ativo (x1, y1, x2, y2) ou None
+
+    @property
+    def pixels(self):
+        """Matriz `uint32` (altura, largura) com os pixels ARGB32."""
+        return self.framebuffer.pixels
+
+    def set_clip(self, clip=None):
+        """Define o recorte ativo (tupla inclusiva) ou limpa-o."""
+        self.clip = None if clip is None else tuple(int(v) for v in clip)
+
+    def writable_bounds(self):
+        """Área gravável (buffer ∩ recorte ativo) como tupla inclusiva; pode ser vazia."""
+        ox, oy = self.origin
+        x1, y1, x2, y2 = ox, oy, ox + self.width - 1, oy + self.height - 1
+        if self.clip is not None:
+            x1, y1 = max(x1, self.clip[0]), max(y1, self.clip[1])
+            x2, y2 = min(x2, self.clip[2]), min(y2, self.clip[3])
+        return x1, y1, x2, y2
+
+    def _local(self, rect):
+        """Retângulo absoluto em coords do buffer (None continua None)."""
+        if rect is None or self.origin == (0, 0):
+            return rect
+        ox, oy = self.origin
+        return rect[0] - ox, rect[1] - oy, rect[2] - ox, rect[3] - oy
+
+    def clear(self, color='white', rect=None):
+        """Limpa o buffer (ou apenas `rect`) com a cor especificada."""
+        self.framebuffer.fill(color_argb(color), self._local(rect))
+
+    def set_pixel(self, x, y, color):
+        """Define a cor de um pixel, respeitando o recorte ativo."""
+        ox, oy = self.origin
+        self.framebuffer.set_pixel(int(x) - ox, int(y) - oy, color_argb(color), self._local(self.clip))
+
+    def set_pixels(self, xs, ys, color):
+        """Define a cor de um lote de pixels (mesma cor) de uma só vez."""
+        if self.origin != (0, 0):
+            xs = np.asarray(xs, dtype=np.intp) - self.origin[0]
+            ys = np.asarray(ys, dtype=np.intp) - self.origin[1]
+        self.framebuffer.write(xs, ys, color_argb(color), self._local(self.clip))
+
+
+def draw_batches(batches, algorithm='Bresenham', canvas=None):
+    """Rasteriza lotes `(tipo, dados, códigos, paleta)` na ordem recebida.
+
+    Círculos vão para `BresenhamCircle.paintCircles`; pontos, retas e arestas
+    de polígonos, como segmentos, para `LinesBatch.paintSegments`. Os pixels
+    vão para `canvas` (None = `Drawing.canvas`).
+    """
+    for kind, data, codes, palette in batches:
+        if kind == 'circles':
+            BresenhamCircle.paintCircles(data, codes, palette, canvas=canvas)
+        else:
+            LinesBatch.paintSegments(data, codes, palette, algorithm, canvas)
+
+
+def chunked(batches, size):
+    """Divide lotes em lotes de no máximo `size` primitivas, na mesma ordem.
+
+    Rasterizar os pedaços em sequência dá o mesmo resultado que os lotes
+    originais (onde primitivas se sobrepõem continua valendo a última).
+    """
+    for kind, data, codes, palette in batches:
+        for i in range(0, len(data), size):
+            yield kind, data[i:i + size], codes[i:i + size], palette
+
+
+def _batch_boxes(kind, data):
+    """Bboxes inteiras inclusivas (N, 4) das primitivas de um lote.
+
+    Segmentos levam 1 pixel de folga (o DDA trunca coordenadas acumuladas);
+    a folga só faz um bloco receber primitivas a mais, nunca pixels a mais.
+    """
+    if kind == 'circles':
+        c = Drawing.snapArray(data).reshape(-1, 3)
+        r = c[:, 2]
+        return np.stack([c[:, 0] - r, c[:, 1] - r, c[:, 0] + r, c[:, 1] + r], axis=1)
+    s = Drawing.snapArray(data).reshape(-1, 4)
+    lo = np.minimum(s[:, :2], s[:, 2:]) - 1
+    hi = np.maximum(s[:, :2], s[:, 2:]) + 1
+    return np.concatenate([lo, hi], axis=1)
+
+
+def _tile_bins(boxes, area, tile):
+    """Distribui as bboxes pelos blocos `tile` x `tile` que intersectam `area`.
+
+    Retorna {(tx, ty): índices em ordem crescente}, isto é, na ordem de desenho.
+    """
+    x1, y1, x2, y2 = area
+    inside = (boxes[:, 0] <= x2) & (boxes[:, 2] >= x1) & (boxes[:, 1] <= y2) & (boxes[:, 3] >= y1)
+    idx = np.flatnonzero(inside)
+    if idx.size == 0:
+        return {}
+    b = boxes[idx]
+    tx1 = np.maximum(b[:, 0], x1) // tile
+    ty1 = np.maximum(b[:, 1], y1) // tile
+    nx = np.minimum(b[:, 2], x2) // tile - tx1 + 1
+    ny = np.minimum(b[:, 3], y2) // tile - ty1 + 1
+    counts = nx * ny
+    # uma linha por par (primitiva, bloco coberto), na ordem das primitivas
+    rows = np.repeat(np.arange(idx.size), counts)
+    k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    tx = tx1[rows] + k % nx[rows]
+    ty = ty1[rows] + k // nx[rows]
+    span = x2 // tile + 1
+    keys = ty * span + tx
+    order = np.argsort(keys, kind='stable')
+    cuts = np.flatnonzero(np.diff(keys[order])) + 1
+    bins = {}
+    for run in np.split(order, cuts):
+        ty0, tx0 = divmod(int(keys[run[0]]), span)
+        bins[(tx0, ty0)] = idx[rows[run]]
+    return bins
+
+
+def _render_tile(rect, pixels, batches, algorithm):
+    """Rasteriza `batches` sobre `pixels` (conteúdo atual de `rect`) e devolve o resultado.
+
+    Função de módulo para poder rodar também em um `ProcessPoolExecutor`.
+    """
+    x1, y1, x2, y2 = rect
+    canvas = ArrayCanvas(x2 - x1 + 1, y2 - y1 + 1, origin=(x1, y1))
+    canvas.framebuffer.blit(pixels)
+    draw_batches(batches, algorithm, canvas)
+    return canvas.pixels
+
+
+def draw_batches_tiled(batches, framebuffer, algorithm='Bresenham', clip=None, executor=None, tile=256):
+    """Rasteriza lotes em blocos independentes e os compõe em `framebuffer`.
+
+    A área gravável (`framebuffer` ∩ `clip`) é dividida em blocos alinhados
+    a múltiplos de `tile`; cada primitiva vai para os blocos que sua bbox
+    toca e cada bloco é rasterizado, sobre uma cópia do seu conteúdo atual,
+    com escrita limitada a ele mesmo. Como os blocos são disjuntos e cada um
+    recebe as primitivas na ordem original, o resultado é idêntico ao de
+    `draw_batches`. Com `executor` (ex.: `ThreadPoolExecutor`, ou
+    `ProcessPoolExecutor`) os blocos rodam em paralelo; sem ele, em série.
+
+    Retorna a lista de retângulos recompostos.
+    """
+    area = framebuffer.bounds(clip)
+    if area is None:
+        return []
+    batches = list(batches)
+    work = {}   # (tx, ty) -> lotes do bloco, na ordem de desenho
+    for kind, data, codes, palette in batches:
+        if len(data) == 0:
+            continue
+        data, codes = np.asarray(data), np.asarray(codes)
+        for key, sel in _tile_bins(_batch_boxes(kind, data), area, tile).items():
+            work.setdefault(key, []).append((kind, data[sel], codes[sel], palette))
+    jobs = []
+    for (tx, ty), tile_batches in sorted(work.items(), key=lambda item: (item[0][1], item[0][0])):
+        rect = framebuffer.bounds((max(area[0], tx * tile), max(area[1], ty * tile),
+                                   min(area[2], (tx + 1) * tile - 1), min(area[3], (ty + 1) * tile - 1)))
+        jobs.append((rect, framebuffer.to_array(rect), tile_batches, algorithm))
+    if executor is None:
+        results = [_render_tile(*job) for job in jobs]
+    else:
+        results = executor.map(_render_tile, *zip(*jobs)) if jobs else []
+    rects = []
+    for job, pixels in zip(jobs, results):
+        framebuffer.paste(job[0], pixels)
+        rects.append(job[0])
+    return rects
+
+
+def render(scene, width, height, algorithm='Bresenham', background='white', clip=None, executor=None):
+    """Rasteriza `scene` em um buffer `width` x `height` e devolve o `ArrayFramebuffer`.
+
+    `scene` é um `SceneStore` ou uma sequência de objetos desenháveis;
+    `algorithm` escolhe a rasterização de retas ('DDA' ou 'Bresenham') e
+    `clip`, opcional, limita a escrita a um retângulo. Com `executor` a cena
+    é rasterizada em blocos paralelos (ver `draw_batches_tiled`).
+    """
+    canvas = ArrayCanvas(width, height, background)
+    canvas.set_clip(clip)
+    batches = scene.batches() if isinstance(scene, SceneStore) else scene_batches(scene)
+    if executor is not None:
+        draw_batches_tiled(batches, canvas.framebuffer, algorithm, canvas.clip, executor)
+    else:
+        # escreve direto no canvas local: não toca no `Drawing.canvas` global
+        draw_batches(batches, algorithm, canvas)
+    return canvas.framebuffer
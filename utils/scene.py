@@ -0,0 +1,285 @@
+"""Armazenamento da cena em estrutura de arrays (struct-of-arrays).
+
+O `SceneStore` guarda as primitivas em tabelas NumPy (float64) paralelas por tipo
+(pontos, retas e círculos; polígonos já são compactos) e uma tabela de ordem
+`(tipo, linha)` que preserva a ordem de desenho. Cores são internadas em uma
+paleta e guardadas como códigos inteiros.
+
+Para a interface (árvore, seleção, transformações) o store entrega *views*:
+objetos `Point`/`Line`/`Circle` cujos atributos leem e escrevem diretamente
+nas tabelas. A rasterização não usa views: `batches()` monta os lotes de
+segmentos e círculos direto dos arrays.
+"""
+
+import numpy as np
+from utils.drawable import Drawing, Point, Line, Circle, Polygon
+
+POINT, LINE, CIRCLE, POLYGON = range(4)
+
+
+class _Table:
+    """Tabela de linhas float64 com crescimento geométrico."""
+
+    __slots__ = ('data', 'n')
+
+    def __init__(self, width, capacity=16):
+        self.data = np.zeros((capacity, width), dtype=np.float64)
+        self.n = 0
+
+    def append(self, row):
+        """Acrescenta uma linha e devolve seu índice."""
+        if self.n == len(self.data):
+            grown = np.zeros((2 * len(self.data), self.data.shape[1]), dtype=self.data.dtype)
+            grown[:self.n] = self.data
+            self.data = grown
+        self.data[self.n] = row
+        self.n += 1
+        return self.n - 1
+
+    @property
+    def rows(self):
+        return self.data[:self.n]
+
+    def clear(self):
+        self.n = 0
+
+
+class _Column:
+    """Descritor de um campo numérico guardado em uma coluna de `_Table`."""
+
+    def __init__(self, col):
+        self.col = col
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return float(obj._table.data[obj._slot, obj._offset + self.col])
+
+    def __set__(self, obj, value):
+        obj._table.data[obj._slot, obj._offset + self.col] = value
+
+
+class _ColorColumn:
+    """Descritor de uma cor guardada como código da paleta do store."""
+
+    def __init__(self, col):
+        self.col = col
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj._store.palette[int(obj._table.data[obj._slot, self.col])]
+
+    def __set__(self, obj, value):
+        obj._table.data[obj._slot, self.col] = obj._store.color_code(value)
+
+
+class _EndpointView(Point):
+    """Par (x, y) de uma linha de tabela (extremo de reta ou centro de círculo)."""
+
+    __slots__ = ('_table', '_slot', '_offset')
+
+    x = _Column(0)
+    y = _Column(1)
+
+    def __init__(self, table, slot, offset):
+        self._bounds = None
+        self._table, self._slot, self._offset = table, slot, offset
+        self.color = None
+
+
+class PointView(Point):
+    """Ponto armazenado no `SceneStore` (colunas x, y, cor)."""
+
+    __slots__ = ('_store', '_table', '_slot', '_offset')
+
+    x = _Column(0)
+    y = _Column(1)
+    color = _ColorColumn(2)
+
+    def __init__(self, store, slot):
+        self._bounds = None
+        self._store, self._table, self._slot, self._offset = store, store.points, slot, 0
+
+
+class LineView(Line):
+    """Reta armazenada no `SceneStore` (colunas xA, yA, xB, yB, cor)."""
+
+    __slots__ = ('_store', '_table', '_slot')
+
+    color = _ColorColumn(4)
+
+    def __init__(self, store, slot):
+        self._bounds = None
+        self._store, self._table, self._slot = store, store.lines, slot
+
+    @property
+    def pointA(self):
+        return _EndpointView(self._table, self._slot, 0)
+
+    @property
+    def pointB(self):
+        return _EndpointView(self._table, self._slot, 2)
+
+
+class CircleView(Circle):
+    """Círculo armazenado no `SceneStore` (colunas xc, yc, raio, cor)."""
+
+    __slots__ = ('_store', '_table', '_slot', '_offset')
+
+    radius = _Column(2)
+    color = _ColorColumn(3)
+
+    def __init__(self, store, slot):
+        self._bounds = None
+        self._store, self._table, self._slot, self._offset = store, store.circles, slot, 0
+
+    @property
+    def center(self):
+        return _EndpointView(self._table, self._slot, 0)
+
+
+class SceneStore:
+    """Cena em tabelas paralelas por tipo, com views de objeto para a UI.
+
+    Indexar o store (`store[i]`) devolve `{'obj': view}`, o mesmo formato de
+    item usado pela janela principal.
+    """
+
+    def __init__(self):
+        self.points = _Table(3)     # x, y, cor
+        self.lines = _Table(5)      # xA, yA, xB, yB, cor
+        self.circles = _Table(4)    # xc, yc, raio, cor
+        self.polygons = []          # objetos Polygon (já guardam um array de vértices)
+        self.order = _Table(2)      # tipo, linha na tabela do tipo
+        self.palette = []
+        self._color_codes = {}
+        self._views = {}
+
+    def __len__(self):
+        return self.order.n
+
+    def __getitem__(self, idx):
+        return {'obj': self.view(idx)}
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def color_code(self, color):
+        """Código inteiro da cor na paleta (internando-a se for nova)."""
+        code = self._color_codes.get(color)
+        if code is None:
+            color = Drawing.internColor(color)
+            code = self._color_codes[color] = len(self.palette)
+            self.palette.append(color)
+        return code
+
+    def append(self, obj):
+        """Copia a primitiva para as tabelas e devolve seu índice na cena."""
+        if isinstance(obj, Point):
+            kind, slot = POINT, self.points.append((obj.x, obj.y, self.color_code(obj.color)))
+        elif isinstance(obj, Line):
+            a, b = obj.pointA, obj.pointB
+            kind, slot = LINE, self.lines.append((a.x, a.y, b.x, b.y, self.color_code(obj.color)))
+        elif isinstance(obj, Circle):
+            c = obj.center
+            kind, slot = CIRCLE, self.circles.append((c.x, c.y, obj.radius, self.color_code(obj.color)))
+        elif isinstance(obj, Polygon):
+            kind, slot = POLYGON, len(self.polygons)
+            self.polygons.append(obj)
+        else:
+            raise TypeError(f'primitiva não suportada: {type(obj).__name__}')
+        return self.order.append((kind, slot))
+
+    def view(self, idx):
+        """View (em cache) do objeto `idx`, com atributos ligados às tabelas."""
+        v = self._views.get(idx)
+        if v is None:
+            kind, slot = (int(v) for v in self.order.data[idx])
+            if kind == POINT:
+                v = PointView(self, slot)
+            elif kind == LINE:
+                v = LineView(self, slot)
+            elif kind == CIRCLE:
+                v = CircleView(self, slot)
+            else:
+                v = self.polygons[slot]
+            self._views[idx] = v
+        return v
+
+    def clear(self):
+        """Esvazia a cena (a paleta é mantida)."""
+        for table in (self.points, self.lines, self.circles, self.order):
+            table.clear()
+        self.polygons.clear()
+        self._views.clear()
+
+    def batches(self, indices=None):
+        """Gera lotes de rasterização na ordem de desenho.
+
+        Cada lote é `(tipo, dados, códigos, paleta)`: `('segments', (N, 4), ...)`
+        para sequências de pontos, retas e arestas de polígonos, ou
+        `('circles', (N, 3), ...)` para sequências de círculos. `indices`
+        (crescentes) restringe os lotes a um subconjunto da cena.
+        """
+        order = self.order.rows
+        if indices is not None:
+            order = order[np.asarray(indices, dtype=np.intp)]
+        if len(order) == 0:
+            return
+        kinds, slots = order[:, 0].astype(np.intp), order[:, 1].astype(np.intp)
+        is_circle = kinds == CIRCLE
+        cuts = np.flatnonzero(is_circle[1:] != is_circle[:-1]) + 1
+        for run in np.split(np.arange(len(order)), cuts):
+            if is_circle[run[0]]:
+                rows = self.circles.rows[slots[run]]
+                yield 'circles', rows[:, :3], rows[:, 3].astype(np.intp), self.palette
+            else:
+                seg, codes, _ = self._segments(kinds[run], slots[run])
+                yield 'segments', seg, codes, self.palette
+
+    def edges(self, indices, kinds=(LINE, POLYGON)):
+        """Segmentos das retas e/ou polígonos entre `indices`, em ordem de desenho.
+
+        Retorna `(seg, dono)`: array (M, 4) e, para cada segmento, o índice na
+        cena do objeto de origem. Objetos de tipos fora de `kinds` (e sempre
+        pontos e círculos) são ignorados.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        order = self.order.rows[indices].astype(np.intp)
+        sel = np.isin(order[:, 0], [k for k in kinds if k in (LINE, POLYGON)])
+        seg, _, counts = self._segments(order[sel, 0], order[sel, 1])
+        return seg, np.repeat(indices[sel], counts)
+
+    def _segments(self, kinds, slots):
+        """Segmentos, código de cor de cada um e segmentos por objeto de uma
+        sequência sem círculos."""
+        counts = np.ones(len(kinds), dtype=np.intp)
+        polys = np.flatnonzero(kinds == POLYGON).tolist()
+        poly_segs = [self.polygons[slots[i]].segments() for i in polys]
+        for i, ps in zip(polys, poly_segs):
+            counts[i] = len(ps)
+        starts = np.cumsum(counts) - counts
+        seg = np.empty((counts.sum(), 4), dtype=np.float64)
+        codes = np.empty(counts.sum(), dtype=np.intp)
+        sel = kinds == POINT
+        rows = self.points.rows[slots[sel]]
+        seg[starts[sel]] = rows[:, [0, 1, 0, 1]]
+        codes[starts[sel]] = rows[:, 2]
+        sel = kinds == LINE
+        rows = self.lines.rows[slots[sel]]
+        seg[starts[sel]] = rows[:, :4]
+        codes[starts[sel]] = rows[:, 4]
+        for i, ps in zip(polys, poly_segs):
+            seg[starts[i]:starts[i] + counts[i]] = ps
+            codes[starts[i]:starts[i] + counts[i]] = self.color_code(self.polygons[slots[i]].color)
+        return seg, codes, counts
+
+
+def scene_batches(objs):
+    """Lotes de rasterização (ver `SceneStore.batches`) para uma lista de objetos."""
+    store = SceneStore()
+    for o in objs:
+        store.append(o)
+    return store.batches()
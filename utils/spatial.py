@@ -0,0 +1,102 @@
+"""Índice espacial em grade uniforme para bounding boxes.
+
+O `UniformGrid` associa chaves (ex.: índices de objetos da cena) a bboxes
+inteiras inclusivas `(x1, y1, x2, y2)` em coords de buffer e responde a
+consultas por ponto ou por retângulo visitando apenas as células envolvidas,
+de modo que o custo depende dos objetos próximos e não do tamanho da cena.
+
+As consultas devolvem as chaves em ordem crescente, preservando a ordem de
+desenho/inserção quando as chaves são índices.
+"""
+
+
+class UniformGrid:
+    """Grade uniforme de células quadradas com listas de chaves por célula."""
+
+    # bboxes que cobririam mais células que isto ficam numa lista à parte
+    MAX_CELLS = 1024
+
+    def __init__(self, cell_size=16):
+        self.cell_size = max(1, int(cell_size))
+        self.cells = {}     # (cx, cy) -> set de chaves
+        self.boxes = {}     # chave -> bbox
+        self.oversized = set()
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def _cell_range(self, box):
+        """Intervalos de células (cx1, cy1, cx2, cy2) cobertos por `box`."""
+        s = self.cell_size
+        return box[0] // s, box[1] // s, box[2] // s, box[3] // s
+
+    def insert(self, key, box):
+        """Insere (ou substitui) a bbox associada a `key`; None não é indexado."""
+        if key in self.boxes:
+            self.remove(key)
+        if box is None:
+            return
+        box = tuple(int(v) for v in box)
+        self.boxes[key] = box
+        cx1, cy1, cx2, cy2 = self._cell_range(box)
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > self.MAX_CELLS:
+            self.oversized.add(key)
+            return
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                self.cells.setdefault((cx, cy), set()).add(key)
+
+    def update(self, key, box):
+        """Atualiza a bbox de `key` (alias de `insert`)."""
+        self.insert(key, box)
+
+    def remove(self, key):
+        """Remove `key` do índice, se presente."""
+        box = self.boxes.pop(key, None)
+        if box is None:
+            return
+        if key in self.oversized:
+            self.oversized.discard(key)
+            return
+        cx1, cy1, cx2, cy2 = self._cell_range(box)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self.cells[(cx, cy)]
+
+    def clear(self):
+        """Esvazia o índice."""
+        self.cells.clear()
+        self.boxes.clear()
+        self.oversized.clear()
+
+    def query(self, box):
+        """Chaves cujas bboxes intersectam `box`, em ordem crescente."""
+        x1, y1, x2, y2 = box
+        cx1, cy1, cx2, cy2 = self._cell_range(box)
+        found = set(self.oversized)
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self.cells):
+            # consulta maior que a grade ocupada: percorre só as células existentes
+            for (cx, cy), bucket in self.cells.items():
+                if cx1 <= cx <= cx2 and cy1 <= cy <= cy2:
+                    found |= bucket
+        else:
+            for cx in range(cx1, cx2 + 1):
+                for cy in range(cy1, cy2 + 1):
+                    bucket = self.cells.get((cx, cy))
+                    if bucket:
+                        found |= bucket
+        hits = []
+        for key in found:
+            b = self.boxes[key]
+            if b[0] <= x2 and x1 <= b[2] and b[1] <= y2 and y1 <= b[3]:
+                hits.append(key)
+        hits.sort()
+        return hits
+
+    def query_point(self, x, y):
+        """Chaves cujas bboxes contêm o ponto (x, y), em ordem crescente."""
+        return self.query((x, y, x, y))
@@ -0,0 +1,103 @@
+"""Viewports preguiçosos sobre a cena.
+
+Um `Viewport` guarda apenas a janela de recorte e referências à cena (o
+`SceneStore` e seu índice espacial): criar uma view não copia nem recorta
+nada. Os objetos recortados são calculados sob demanda, em lote, na primeira
+vez em que são desenhados ou consultados, e ficam num cache por índice da
+cena. Quem altera um objeto de origem deve chamar `invalidate(índice)`.
+
+Janelas e caixas são tuplas inclusivas `(x1, y1, x2, y2)` em coords de buffer.
+"""
+
+from utils.drawable import Drawing, Point, Line, Circle, Polygon
+from utils.algorithms import BresenhamCircle, ClippingCS, ClippingLB, ClippingSH
+from utils.scene import LINE
+
+
+class Viewport:
+    """Janela de recorte sobre um `SceneStore`, com cache de recortes por objeto."""
+
+    def __init__(self, name, window, store, index, algorithm='Cohen-Sutherland'):
+        self.name = name
+        self.window = tuple(int(v) for v in window)
+        self.store = store          # SceneStore de origem
+        self.index = index          # UniformGrid da origem (bboxes em coords de buffer)
+        self.algorithm = algorithm  # recorte de retas: 'Cohen-Sutherland' ou 'Liang-Barsky'
+        self.cache = {}             # índice da cena -> objeto recortado (None se invisível)
+
+    def invalidate(self, key=None):
+        """Descarta o recorte em cache de `key` (ou de todos os objetos)."""
+        if key is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(key, None)
+
+    def _window(self, box=None):
+        """Janela da view, ou sua interseção com `box` (None se vazia)."""
+        x1, y1, x2, y2 = self.window
+        if box is not None:
+            x1, y1 = max(x1, box[0]), max(y1, box[1])
+            x2, y2 = min(x2, box[2]), min(y2, box[3])
+        if x1 > x2 or y1 > y2:
+            return None
+        return x1, y1, x2, y2
+
+    def clipped(self, keys):
+        """Objetos recortados (None quando invisíveis) de `keys`, usando o cache."""
+        missing = [k for k in keys if k not in self.cache]
+        if missing:
+            self._clip(missing)
+        return [self.cache[k] for k in keys]
+
+    def objects(self, box=None):
+        """Pares `(índice, objeto recortado)` visíveis na janela (∩ `box`).
+
+        Os candidatos vêm do índice espacial da origem, em ordem de desenho.
+        """
+        w = self._window(box)
+        if w is None:
+            return []
+        keys = self.index.query(w)
+        return [(k, o) for k, o in zip(keys, self.clipped(keys)) if o is not None]
+
+    def query(self, box):
+        """Índices cujos objetos recortados têm bbox intersectando `box`."""
+        hits = []
+        for k, o in self.objects(box):
+            b = o.bounds()
+            if b is not None and b[0] <= box[2] and box[0] <= b[2] and b[1] <= box[3] and box[1] <= b[3]:
+                hits.append(k)
+        return hits
+
+    def query_point(self, x, y):
+        """Índices cujos objetos recortados têm bbox contendo (x, y)."""
+        return self.query((x, y, x, y))
+
+    def _clip(self, keys):
+        """Recorta os objetos `keys` da origem e guarda o resultado no cache."""
+        x1, y1, x2, y2 = self.window
+        clipper = (ClippingCS if self.algorithm == 'Cohen-Sutherland' else ClippingLB)(x1, x2, y1, y2)
+        # retas são recortadas em um único lote; polígonos, como polígonos fechados
+        seg, owner = self.store.edges(keys, kinds=(LINE,))
+        accepted, ends = clipper.clip_lines(seg)
+        pieces = dict(zip(owner[accepted].tolist(), ends[accepted].tolist()))
+        poly_clipper = ClippingSH(x1, x2, y1, y2)
+        for k in keys:
+            obj = self.store.view(k)
+            out = None
+            if isinstance(obj, Point):
+                if x1 <= Drawing.snap(obj.x) <= x2 and y1 <= Drawing.snap(obj.y) <= y2:
+                    out = Point(obj.x, obj.y, obj.color)
+            elif isinstance(obj, Line):
+                if k in pieces:
+                    xA, yA, xB, yB = pieces[k]
+                    out = Line(Point(xA, yA), Point(xB, yB), obj.color)
+            elif isinstance(obj, Circle):
+                # mantém o círculo só se algum pixel cai na janela (os arcos
+                # em si só são gerados na rasterização)
+                xc, yc = Drawing.snap(obj.center.x), Drawing.snap(obj.center.y)
+                if BresenhamCircle.isVisible(Drawing.snap(obj.radius), (x1 - xc, y1 - yc, x2 - xc, y2 - yc)):
+                    out = Circle(Point(obj.center.x, obj.center.y), obj.radius, obj.color)
+            elif isinstance(obj, Polygon):
+                out = poly_clipper.clip_polygon(obj)
+            self.cache[k] = out